@@ -0,0 +1,236 @@
+from pathlib import Path
+import argparse
+import csv
+import json
+import os
+import platform
+import subprocess
+import sys
+import time
+
+from main import (
+    CODEC_PRESETS,
+    DEFAULT_SPEED_PROFILE,
+    QUALITY_PRESETS,
+    RESOLUTION_PRESETS,
+    SPEED_PROFILES,
+    build_scale_filter,
+    check_ffmpeg,
+    run_ffmpeg,
+)
+
+
+BENCH_FPS = 30
+DEFAULT_SOURCES = ["testsrc2:1280x720:10", "mandelbrot:1920x1080:10", "testsrc2:640x360:5"]
+REGRESSION_TOLERANCE = 0.10
+CSV_FIELDS = [
+    "source",
+    "codec",
+    "quality",
+    "resolution",
+    "speed_profile",
+    "ok",
+    "wall_seconds",
+    "cpu_seconds",
+    "peak_rss_kb",
+    "encode_fps",
+    "output_bytes",
+]
+
+
+def parse_source_spec(spec: str) -> tuple[str, int, int, int]:
+    kind, size, duration = spec.split(":")
+    width, height = size.lower().split("x")
+    return kind, int(width), int(height), int(duration)
+
+
+def generate_source(spec: str, work_dir: Path) -> Path:
+    kind, width, height, duration = parse_source_spec(spec)
+    source_file = work_dir / f"{kind}_{width}x{height}_{duration}s.mkv"
+    if source_file.exists():
+        return source_file
+    work_dir.mkdir(parents=True, exist_ok=True)
+    cmd = [
+        "ffmpeg",
+        "-y",
+        "-f",
+        "lavfi",
+        "-i",
+        f"{kind}=size={width}x{height}:rate={BENCH_FPS}",
+        "-f",
+        "lavfi",
+        "-i",
+        "sine=frequency=440:sample_rate=48000",
+        "-t",
+        str(duration),
+        "-vf",
+        "noise=alls=12:allf=t+u:all_seed=42,format=yuv420p",
+        "-c:v",
+        "ffv1",
+        "-c:a",
+        "pcm_s16le",
+        str(source_file),
+    ]
+    result = subprocess.run(cmd, capture_output=True, text=True)
+    if result.returncode != 0:
+        raise RuntimeError(f"Falha ao gerar fonte {spec}:\n{result.stderr.strip()}")
+    return source_file
+
+
+def ffmpeg_version() -> str:
+    result = subprocess.run(["ffmpeg", "-hide_banner", "-version"], capture_output=True, text=True)
+    return (result.stdout.splitlines() or ["desconhecida"])[0]
+
+
+def run_benchmark(
+    sources: list[str],
+    codecs: list[str],
+    qualities: list[str],
+    resolutions: list[str],
+    work_dir: Path,
+    speed_profiles: list[str] | None = None,
+) -> list[dict]:
+    rows: list[dict] = []
+    out_dir = work_dir / "saidas"
+    out_dir.mkdir(parents=True, exist_ok=True)
+    speeds = speed_profiles or [DEFAULT_SPEED_PROFILE]
+    combos = [
+        (s, c, q, r, p)
+        for s in sources
+        for c in codecs
+        for q in qualities
+        for r in resolutions
+        for p in speeds
+    ]
+    for number, (spec, codec_name, quality_name, resolution_name, speed_profile) in enumerate(combos, start=1):
+        source_file = generate_source(spec, work_dir)
+        _, _, _, duration = parse_source_spec(spec)
+        target_file = out_dir / f"bench_{number:04d}.mkv"
+        stats: dict = {}
+        print(
+            f"[{number}/{len(combos)}] {spec} | {codec_name} | {quality_name} | {resolution_name} | {speed_profile}",
+            flush=True,
+        )
+        ok, msg, _ = run_ffmpeg(
+            source_file=source_file,
+            target_file=target_file,
+            crf=QUALITY_PRESETS[quality_name],
+            codec_args=CODEC_PRESETS[codec_name],
+            scale_filter=build_scale_filter(RESOLUTION_PRESETS[resolution_name]),
+            dvd_target=None,
+            stats=stats,
+            speed_profile=speed_profile,
+        )
+        wall = stats.get("wall_seconds") or 0.0
+        rows.append(
+            {
+                "source": spec,
+                "codec": codec_name,
+                "quality": quality_name,
+                "resolution": resolution_name,
+                "speed_profile": speed_profile,
+                "ok": ok,
+                "wall_seconds": round(wall, 3),
+                "cpu_seconds": round(stats["cpu_seconds"], 3) if stats.get("cpu_seconds") is not None else None,
+                "peak_rss_kb": stats.get("peak_rss_kb"),
+                "encode_fps": round(duration * BENCH_FPS / wall, 2) if ok and wall else None,
+                "output_bytes": target_file.stat().st_size if ok and target_file.exists() else None,
+            }
+        )
+        if not ok:
+            print(msg.splitlines()[0], flush=True)
+        target_file.unlink(missing_ok=True)
+    return rows
+
+
+def _row_key(row: dict) -> tuple[str, ...]:
+    return (
+        row["source"],
+        row["codec"],
+        row["quality"],
+        row["resolution"],
+        row.get("speed_profile", DEFAULT_SPEED_PROFILE),
+    )
+
+
+def compare_with_baseline(rows: list[dict], baseline_rows: list[dict], tolerance: float) -> list[str]:
+    baseline = {_row_key(row): row for row in baseline_rows}
+    regressions: list[str] = []
+    for row in rows:
+        old = baseline.get(_row_key(row))
+        if not old:
+            continue
+        label = " | ".join(_row_key(row))
+        if old.get("ok") and not row.get("ok"):
+            regressions.append(f"{label}: passou a falhar")
+            continue
+        if old.get("encode_fps") and row.get("encode_fps"):
+            if row["encode_fps"] < old["encode_fps"] * (1 - tolerance):
+                regressions.append(f"{label}: fps {old['encode_fps']} -> {row['encode_fps']}")
+        if old.get("output_bytes") and row.get("output_bytes"):
+            if row["output_bytes"] > old["output_bytes"] * (1 + tolerance):
+                regressions.append(f"{label}: bytes {old['output_bytes']} -> {row['output_bytes']}")
+        if old.get("peak_rss_kb") and row.get("peak_rss_kb"):
+            if row["peak_rss_kb"] > old["peak_rss_kb"] * (1 + tolerance):
+                regressions.append(f"{label}: RSS {old['peak_rss_kb']} -> {row['peak_rss_kb']} KB")
+    return regressions
+
+
+def write_results(rows: list[dict], csv_file: Path | None, json_file: Path | None) -> None:
+    if csv_file:
+        with csv_file.open("w", newline="", encoding="utf-8") as fh:
+            writer = csv.DictWriter(fh, fieldnames=CSV_FIELDS)
+            writer.writeheader()
+            writer.writerows(rows)
+    if json_file:
+        payload = {
+            "created_at": time.strftime("%Y-%m-%dT%H:%M:%S"),
+            "ffmpeg": ffmpeg_version(),
+            "platform": platform.platform(),
+            "cpu_count": os.cpu_count(),
+            "results": rows,
+        }
+        json_file.write_text(json.dumps(payload, indent=2, ensure_ascii=False), encoding="utf-8")
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description="Benchmark dos presets de codec, qualidade e resolucao.")
+    parser.add_argument("--sources", nargs="+", default=DEFAULT_SOURCES, help="Fontes lavfi no formato tipo:LxA:segundos")
+    parser.add_argument("--codecs", nargs="+", default=list(CODEC_PRESETS), choices=list(CODEC_PRESETS))
+    parser.add_argument("--qualities", nargs="+", default=list(QUALITY_PRESETS), choices=list(QUALITY_PRESETS))
+    parser.add_argument("--resolutions", nargs="+", default=list(RESOLUTION_PRESETS), choices=list(RESOLUTION_PRESETS))
+    parser.add_argument("--speed-profiles", nargs="+", default=[DEFAULT_SPEED_PROFILE], choices=list(SPEED_PROFILES))
+    parser.add_argument("--work-dir", type=Path, default=Path("bench_work"))
+    parser.add_argument("--csv", type=Path, default=Path("bench_results.csv"))
+    parser.add_argument("--json", type=Path, default=Path("bench_results.json"))
+    parser.add_argument("--baseline", type=Path, default=None, help="JSON de uma execucao anterior para comparar")
+    parser.add_argument("--tolerance", type=float, default=REGRESSION_TOLERANCE)
+    args = parser.parse_args()
+
+    if not check_ffmpeg():
+        parser.error("FFmpeg nao encontrado no PATH.")
+
+    rows = run_benchmark(
+        args.sources,
+        args.codecs,
+        args.qualities,
+        args.resolutions,
+        args.work_dir,
+        args.speed_profiles,
+    )
+    write_results(rows, args.csv, args.json)
+    print(f"Resultados: {args.csv} | {args.json}")
+
+    if args.baseline:
+        baseline_rows = json.loads(args.baseline.read_text(encoding="utf-8")).get("results", [])
+        regressions = compare_with_baseline(rows, baseline_rows, args.tolerance)
+        if regressions:
+            print("Regressoes em relacao a linha de base:")
+            for line in regressions:
+                print(f"  {line}")
+            sys.exit(1)
+        print("Sem regressoes em relacao a linha de base.")
+
+
+if __name__ == "__main__":
+    main()
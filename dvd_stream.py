@@ -0,0 +1,344 @@
+from collections import deque
+from concurrent.futures import ThreadPoolExecutor
+from pathlib import Path
+import errno
+import os
+import shutil
+import subprocess
+import tempfile
+import threading
+import time
+from typing import Callable
+
+from job_control import JobControl
+from main import (
+    DEFAULT_DVD_MEDIUM,
+    DVD_MEDIA,
+    DVD_TARGET_PRESETS,
+    STDERR_TAIL_LINES,
+    CancelCheck,
+    ProgressCallback,
+    _drain_to_tail,
+    build_dvd_args,
+    build_dvd_output_dir,
+    check_tool,
+    dvdauthor_video_format,
+    execute_ffmpeg,
+    execute_ffmpeg_two_pass,
+    media_duration,
+    plan_dvd_bitrate,
+    probe_media_many,
+    resolve_worker_count,
+    threads_per_job,
+)
+
+
+STREAM_BUFFER_BYTES = 256 * 1024 * 1024
+STREAM_CHUNK_BYTES = 1024 * 1024
+FIFO_POLL_SECONDS = 0.05
+
+
+def can_stream_dvd() -> bool:
+    return hasattr(os, "mkfifo") and check_tool("dvdauthor")
+
+
+class ReadAheadBudget:
+    def __init__(self, limit_bytes: int, on_abort: Callable[[], None] | None = None):
+        self.limit_bytes = limit_bytes
+        self.on_abort = on_abort
+        self.used = 0
+        self.head = 0
+        self.aborted = False
+        self._cond = threading.Condition()
+
+    def reserve(self, title: int, size: int) -> bool:
+        with self._cond:
+            while not self.aborted and title != self.head and self.used + size > self.limit_bytes:
+                self._cond.wait()
+            if self.aborted:
+                return False
+            self.used += size
+            return True
+
+    def release(self, size: int) -> None:
+        with self._cond:
+            self.used -= size
+            self._cond.notify_all()
+
+    def advance(self) -> None:
+        with self._cond:
+            self.head += 1
+            self._cond.notify_all()
+
+    def abort(self) -> None:
+        with self._cond:
+            first = not self.aborted
+            self.aborted = True
+            self._cond.notify_all()
+        if first and self.on_abort:
+            self.on_abort()
+
+
+class TitleRelay:
+    def __init__(self, title: int, work_dir: Path, budget: ReadAheadBudget):
+        self.title = title
+        self.budget = budget
+        self.encoder_fifo = work_dir / f"enc_{title:03d}.mpg"
+        self.author_fifo = work_dir / f"titulo_{title:03d}.mpg"
+        os.mkfifo(self.encoder_fifo)
+        os.mkfifo(self.author_fifo)
+        self._chunks: deque[bytes] = deque()
+        self._cond = threading.Condition()
+        self._eof = False
+        self._read_fd = os.open(self.encoder_fifo, os.O_RDONLY | os.O_NONBLOCK)
+        self._hold_fd: int | None = os.open(self.encoder_fifo, os.O_WRONLY)
+        os.set_blocking(self._read_fd, True)
+        self._reader = threading.Thread(target=self._read, daemon=True)
+        self._writer = threading.Thread(target=self._write, daemon=True)
+        self._reader.start()
+        self._writer.start()
+
+    def encoder_done(self) -> None:
+        if self._hold_fd is not None:
+            os.close(self._hold_fd)
+            self._hold_fd = None
+
+    def _read(self) -> None:
+        try:
+            while True:
+                data = os.read(self._read_fd, STREAM_CHUNK_BYTES)
+                if not data:
+                    break
+                if not self.budget.reserve(self.title, len(data)):
+                    continue
+                with self._cond:
+                    self._chunks.append(data)
+                    self._cond.notify_all()
+        finally:
+            os.close(self._read_fd)
+            with self._cond:
+                self._eof = True
+                self._cond.notify_all()
+
+    def _open_author_fifo(self) -> int | None:
+        while not self.budget.aborted:
+            try:
+                fd = os.open(self.author_fifo, os.O_WRONLY | os.O_NONBLOCK)
+            except OSError as exc:
+                if exc.errno != errno.ENXIO:
+                    raise
+                time.sleep(FIFO_POLL_SECONDS)
+                continue
+            os.set_blocking(fd, True)
+            return fd
+        return None
+
+    def _write(self) -> None:
+        fd = None
+        try:
+            fd = self._open_author_fifo()
+            while fd is not None:
+                with self._cond:
+                    while not self._chunks and not self._eof and not self.budget.aborted:
+                        self._cond.wait(0.5)
+                    if self.budget.aborted or (not self._chunks and self._eof):
+                        break
+                    data = self._chunks.popleft()
+                try:
+                    view = memoryview(data)
+                    while view:
+                        view = view[os.write(fd, view) :]
+                finally:
+                    self.budget.release(len(data))
+        except OSError:
+            self.budget.abort()
+        finally:
+            if fd is not None:
+                os.close(fd)
+            with self._cond:
+                dropped = sum(len(chunk) for chunk in self._chunks)
+                self._chunks.clear()
+            if dropped:
+                self.budget.release(dropped)
+            self.budget.advance()
+
+    def close(self) -> None:
+        self.encoder_done()
+        self._reader.join(timeout=5)
+        self._writer.join(timeout=5)
+
+
+def build_video_ts_streamed(
+    selected_videos: list[Path],
+    selected_output_dir: Path | None,
+    dvd_profile_name: str = "DVD NTSC (720x480, 29.97fps)",
+    max_workers: int = 1,
+    progress_callback: ProgressCallback | None = None,
+    cancel_check: CancelCheck | None = None,
+    dvd_medium: str = DEFAULT_DVD_MEDIUM,
+    two_pass: bool = False,
+) -> tuple[bool, str]:
+    if not can_stream_dvd():
+        return False, "A geracao direta precisa do dvdauthor nativo (Linux/macOS); use Converter fila + Criar VIDEO_TS."
+    queue = list(selected_videos)
+    if not queue:
+        return False, "Adicione videos na fila antes de gerar o DVD."
+    dvd_target = DVD_TARGET_PRESETS.get(dvd_profile_name)
+    if dvd_target is None:
+        return False, "Escolha um perfil de DVD (PAL ou NTSC) antes de gerar o DVD."
+    media_info = probe_media_many(queue)
+    probed = [media_duration(media_info.get(path)) for path in queue]
+    video_kbps, plan_note = plan_dvd_bitrate(probed, dvd_medium)
+    if DVD_MEDIA.get(dvd_medium) and video_kbps is None:
+        return False, plan_note
+    base_dir = selected_output_dir if selected_output_dir else queue[0].parent
+    dvd_output_dir = build_dvd_output_dir(base_dir)
+    dvd_output_dir.mkdir(parents=True)
+    video_format = dvdauthor_video_format(dvd_profile_name)
+
+    durations = [duration or 1.0 for duration in probed]
+    total_duration = sum(durations)
+    workers = resolve_worker_count(max_workers, len(queue))
+    threads = threads_per_job(workers) if workers > 1 else None
+    fractions = [0.0] * len(queue)
+    progress_lock = threading.Lock()
+    control = cancel_check if isinstance(cancel_check, JobControl) else None
+    title_controls: list[JobControl] = []
+
+    def cancel_titles() -> None:
+        with progress_lock:
+            controls = list(title_controls)
+        for title_control in controls:
+            title_control.cancel()
+
+    budget = ReadAheadBudget(STREAM_BUFFER_BYTES, on_abort=cancel_titles)
+    failures: list[str] = []
+
+    def should_stop() -> bool:
+        return budget.aborted or bool(cancel_check and cancel_check())
+
+    work_dir = Path(tempfile.mkdtemp(prefix="dvd_fluxo_"))
+    relays: list[TitleRelay] = []
+    author = None
+    ok = False
+    try:
+        for title in range(len(queue)):
+            relays.append(TitleRelay(title, work_dir, budget))
+        author = subprocess.Popen(
+            [
+                "dvdauthor",
+                "-o",
+                str(dvd_output_dir),
+                "-f",
+                video_format,
+                "-t",
+                *(str(relay.author_fifo) for relay in relays),
+            ],
+            stdout=subprocess.DEVNULL,
+            stderr=subprocess.PIPE,
+            text=True,
+            encoding="utf-8",
+            errors="replace",
+        )
+        author_tail: deque[str] = deque(maxlen=STDERR_TAIL_LINES)
+        author_reader = threading.Thread(target=_drain_to_tail, args=(author.stderr, author_tail), daemon=True)
+        author_reader.start()
+
+        def watch_author() -> None:
+            author.wait()
+            if author.returncode != 0:
+                budget.abort()
+
+        threading.Thread(target=watch_author, daemon=True).start()
+
+        def encode_title(title: int) -> None:
+            source_file = queue[title]
+            title_control = control.child(source_file) if control else None
+            if title_control:
+                with progress_lock:
+                    title_controls.append(title_control)
+                if budget.aborted:
+                    title_control.cancel()
+
+            def on_title_progress(_message: str, fraction: float | None, _done: int | None, _total: int | None) -> None:
+                if fraction is None or not progress_callback:
+                    return
+                with progress_lock:
+                    fractions[title] = fraction
+                    overall = sum(f * d for f, d in zip(fractions, durations)) / total_duration
+                    progress_callback(
+                        f"DVD direto: titulo {title + 1}/{len(queue)} ({source_file.name}), "
+                        f"gravando titulo {min(budget.head + 1, len(queue))}",
+                        overall,
+                        None,
+                        None,
+                    )
+
+            try:
+                if should_stop():
+                    return
+                cmd = [
+                    "ffmpeg",
+                    "-y",
+                    "-nostats",
+                    "-progress",
+                    "pipe:1",
+                    "-i",
+                    str(source_file),
+                    *build_dvd_args(dvd_target, threads, video_kbps),
+                ]
+                output = str(relays[title].encoder_fifo)
+                stop_check = title_control or should_stop
+                if two_pass:
+                    returncode, error_msg, canceled = execute_ffmpeg_two_pass(
+                        cmd, output, stop_check, on_title_progress, durations[title]
+                    )
+                else:
+                    returncode, error_msg, canceled = execute_ffmpeg(
+                        [*cmd, output], stop_check, on_title_progress, durations[title]
+                    )
+                if returncode != 0 and not canceled:
+                    failures.append(f"{source_file.name}\n{error_msg or 'Erro desconhecido no FFmpeg.'}")
+                    budget.abort()
+            finally:
+                relays[title].encoder_done()
+                if title_control:
+                    title_control.close()
+
+        with ThreadPoolExecutor(max_workers=workers, thread_name_prefix="dvd-titulo") as pool:
+            list(pool.map(encode_title, range(len(queue))))
+        if budget.aborted or (cancel_check and cancel_check()):
+            budget.abort()
+            if author.poll() is None:
+                author.terminate()
+        author.wait()
+        author_reader.join(timeout=1)
+        if cancel_check and cancel_check():
+            return False, "Geracao do DVD cancelada."
+        if failures:
+            return False, "Falha ao codificar:\n" + "\n".join(failures)
+        if author.returncode != 0:
+            return False, "\n".join(author_tail).strip() or "Falha ao criar titulos DVD."
+        table = subprocess.run(
+            ["dvdauthor", "-o", str(dvd_output_dir), "-f", video_format, "-T"],
+            capture_output=True,
+            text=True,
+        )
+        if table.returncode != 0:
+            return False, table.stderr.strip() or "Falha ao criar tabela DVD."
+        video_ts = dvd_output_dir / "VIDEO_TS"
+        if not video_ts.exists():
+            return False, f"Processo concluido sem VIDEO_TS em {dvd_output_dir}."
+        ok = True
+        message = f"VIDEO_TS criado em: {video_ts} (sem arquivos .mpg intermediarios)"
+        return True, f"{message}\n{plan_note}" if plan_note else message
+    finally:
+        budget.abort()
+        if author is not None and author.poll() is None:
+            author.kill()
+            author.wait()
+        for relay in relays:
+            relay.close()
+        shutil.rmtree(work_dir, ignore_errors=True)
+        if not ok:
+            shutil.rmtree(dvd_output_dir, ignore_errors=True)
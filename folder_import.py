@@ -0,0 +1,171 @@
+from concurrent.futures import FIRST_COMPLETED, ThreadPoolExecutor, wait
+from fnmatch import fnmatch
+from pathlib import Path
+from typing import Callable
+import os
+import time
+
+from main import (
+    VIDEO_EXTENSIONS,
+    CancelCheck,
+    get_media_cache,
+    is_converted_output,
+    media_streams,
+    probe_media_many,
+)
+
+
+IMPORT_WORKERS = 8
+IMPORT_FLUSH_SECONDS = 0.25
+SNIFF_BYTES = 512
+TS_PACKET = 188
+VIDEO_FTYP_BRANDS = {
+    b"isom", b"iso2", b"iso4", b"iso5", b"iso6", b"mp41", b"mp42", b"avc1", b"qt  ",
+    b"M4V ", b"M4VH", b"M4VP", b"3gp4", b"3gp5", b"3gp6", b"3g2a", b"mmp4", b"dash",
+    b"f4v ", b"MSNV", b"XAVC", b"NDAS", b"hvc1",
+}
+AMBIGUOUS_CONTAINERS = {"mp4", "matroska", "ogg", "asf", "flv", "mpegts", "avi"}
+PROBE_BATCH = 64
+
+
+def sniff_container(header: bytes) -> str | None:
+    if len(header) >= 12 and header[4:8] == b"ftyp":
+        return "mp4" if header[8:12] in VIDEO_FTYP_BRANDS else None
+    if len(header) >= 12 and header[4:8] in (b"moov", b"mdat", b"wide", b"free", b"skip"):
+        return "mp4"
+    if header.startswith(b"\x1a\x45\xdf\xa3"):
+        return "matroska"
+    if header.startswith(b"RIFF") and header[8:12] in (b"AVI ", b"AVIX"):
+        return "avi"
+    if header.startswith(b"\x00\x00\x01\xba") or header.startswith(b"\x00\x00\x01\xb3"):
+        return "mpeg"
+    if header.startswith(b"FLV"):
+        return "flv"
+    if header.startswith(b"\x30\x26\xb2\x75\x8e\x66\xcf\x11"):
+        return "asf"
+    if header.startswith(b"OggS"):
+        return "ogg"
+    for offset, packet in ((0, TS_PACKET), (4, TS_PACKET + 4)):
+        if len(header) > offset + 2 * packet and all(header[offset + i * packet] == 0x47 for i in range(3)):
+            return "mpegts"
+    return None
+
+
+def read_header(path: Path) -> bytes | None:
+    try:
+        with path.open("rb") as fh:
+            return fh.read(SNIFF_BYTES)
+    except OSError:
+        return None
+
+
+def _matches(name: str, rel: str, patterns: list[str]) -> bool:
+    return any(fnmatch(name, pattern) or fnmatch(rel, pattern) for pattern in patterns)
+
+
+def _scan_directory(
+    directory: Path,
+    root: Path,
+    include: list[str],
+    exclude: list[str],
+) -> tuple[list[Path], list[Path], list[Path], int]:
+    subdirs: list[Path] = []
+    videos: list[Path] = []
+    unknown: list[Path] = []
+    rejected = 0
+    try:
+        with os.scandir(directory) as it:
+            entries = sorted(it, key=lambda entry: entry.name)
+    except OSError:
+        return [], [], [], 0
+    for entry in entries:
+        if entry.name.startswith("."):
+            continue
+        rel = Path(entry.path).relative_to(root).as_posix()
+        if exclude and _matches(entry.name, rel, exclude):
+            continue
+        try:
+            if entry.is_dir(follow_symlinks=False):
+                subdirs.append(Path(entry.path))
+                continue
+            if not entry.is_file():
+                continue
+        except OSError:
+            continue
+        if include and not _matches(entry.name, rel, include):
+            continue
+        path = Path(entry.path)
+        if is_converted_output(path):
+            continue
+        header = read_header(path)
+        container = sniff_container(header) if header else None
+        if container in AMBIGUOUS_CONTAINERS:
+            unknown.append(path)
+        elif container:
+            videos.append(path)
+        elif header and path.suffix.lower() in VIDEO_EXTENSIONS:
+            unknown.append(path)
+        else:
+            rejected += 1
+    return videos, unknown, subdirs, rejected
+
+
+def _probe_videos(paths: list[Path]) -> tuple[list[Path], int]:
+    videos: list[Path] = []
+    rejected = 0
+    for path, info in probe_media_many(paths, save=False).items():
+        if media_streams(info, "video"):
+            videos.append(path)
+        else:
+            rejected += 1
+    return sorted(videos), rejected
+
+
+def import_folder(
+    root: Path,
+    on_found: Callable[[list[Path]], None],
+    include: list[str] | None = None,
+    exclude: list[str] | None = None,
+    workers: int = IMPORT_WORKERS,
+    cancel_check: CancelCheck | None = None,
+) -> tuple[int, int]:
+    def canceled() -> bool:
+        return bool(cancel_check and cancel_check())
+
+    found = 0
+    rejected = 0
+    buffer: list[Path] = []
+    unknown: list[Path] = []
+    last_flush = time.monotonic()
+    with ThreadPoolExecutor(max_workers=workers, thread_name_prefix="folder-import") as pool:
+        pending = {pool.submit(_scan_directory, root, root, include or [], exclude or [])}
+        while pending:
+            done, pending = wait(pending, timeout=IMPORT_FLUSH_SECONDS, return_when=FIRST_COMPLETED)
+            for future in done:
+                videos, dir_unknown, subdirs, dir_rejected = future.result()
+                buffer.extend(videos)
+                unknown.extend(dir_unknown)
+                found += len(videos)
+                rejected += dir_rejected
+                if not canceled():
+                    pending.update(
+                        pool.submit(_scan_directory, subdir, root, include or [], exclude or [])
+                        for subdir in subdirs
+                    )
+            if canceled():
+                buffer = []
+                unknown = []
+            if unknown and (len(unknown) >= PROBE_BATCH or not pending):
+                videos, probe_rejected = _probe_videos(unknown)
+                unknown = []
+                buffer.extend(videos)
+                found += len(videos)
+                rejected += probe_rejected
+            if buffer and (time.monotonic() - last_flush >= IMPORT_FLUSH_SECONDS or not pending):
+                on_found(buffer)
+                buffer = []
+                last_flush = time.monotonic()
+    if buffer and not canceled():
+        on_found(buffer)
+    get_media_cache().save()
+    return found, rejected
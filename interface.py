@@ -1,27 +1,80 @@
 from pathlib import Path
 import threading
 import time
-import tkinter as tk
 import os
 
 import flet as ft
 
+from job_control import JobControl
 from main import (
     CODEC_PRESETS,
+    DEFAULT_DVD_MEDIUM,
+    DVD_MEDIA,
     DVD_TARGET_PRESETS,
+    LADDER_PRESETS,
+    AUTO_SPEED_PROFILE,
+    DEFAULT_SPEED_PROFILE,
     OUTPUT_FORMATS,
+    QUALITY_METRICS,
     QUALITY_PRESETS,
+    QUALITY_TARGET_DEFAULTS,
     RESOLUTION_PRESETS,
+    SPEED_PROFILES,
     VIDEO_EXTENSIONS,
     check_ffmpeg,
-    check_dvdauthor,
+    check_dvdauthor_cached,
     convert_video_queue,
     create_video_ts_from_selection,
+    build_ladder_renditions,
+    predict_queue,
+    predict_report,
+    preflight_report,
+    probe_media_many,
+    remove_stale_partials,
+    user_config_dir,
 )
+from queue_model import VideoQueue
 from splash_screen import build_splash_container, run_startup_splash
 
 
+UI_REFRESH_SECONDS = 0.15
+QUEUE_ROW_HEIGHT = 24
+QUEUE_PAGE_ROWS = 100
+
+
+def format_seconds(seconds: float) -> str:
+    sec = max(0, int(seconds))
+    h = sec // 3600
+    m = (sec % 3600) // 60
+    s = sec % 60
+    if h > 0:
+        return f"{h:02d}:{m:02d}:{s:02d}"
+    return f"{m:02d}:{s:02d}"
+
+
+def screen_size(page: ft.Page) -> tuple[int, int]:
+    if os.name == "nt":
+        try:
+            import ctypes
+
+            user32 = ctypes.windll.user32
+            return user32.GetSystemMetrics(0), user32.GetSystemMetrics(1)
+        except Exception:
+            pass
+    for width, height in [
+        (getattr(getattr(page, "window", None), "width", None), getattr(getattr(page, "window", None), "height", None)),
+        (getattr(page, "width", None), getattr(page, "height", None)),
+    ]:
+        if width and height:
+            return int(width), int(height)
+    return 1280, 720
+
+
 def app_main(page: ft.Page):
+    from job_metrics import JobEventLog
+    from job_queue import PersistentQueue
+    from scheduler import DEFAULT_SCHEDULING_POLICY, PRIORITY_LEVELS, SCHEDULING_POLICIES
+
     def rgba(hex_color: str, alpha: float) -> str:
         h = hex_color.lstrip("#")
         r = int(h[0:2], 16)
@@ -29,14 +82,7 @@ def app_main(page: ft.Page):
         b = int(h[4:6], 16)
         return f"rgba({r},{g},{b},{alpha})"
 
-    try:
-        root = tk.Tk()
-        root.withdraw()
-        screen_w = root.winfo_screenwidth()
-        screen_h = root.winfo_screenheight()
-        root.destroy()
-    except Exception:
-        screen_w, screen_h = 1280, 720
+    screen_w, screen_h = screen_size(page)
 
     target_w = int(screen_w * 0.35)
     target_h = int(screen_h * 0.70)
@@ -94,7 +140,15 @@ def app_main(page: ft.Page):
     ffmpeg_ok = False
     dvdauthor_ok = False
     selected_output_dir: Path | None = None
-    selected_videos: list[Path] = []
+    selected_videos = VideoQueue()
+    selected_item: Path | None = None
+    item_priorities: dict[Path, int] = {}
+    last_prediction: dict = {"settings": None, "values": None}
+    job_event_log = JobEventLog(user_config_dir() / "logs" / "jobs.jsonl")
+    job_queue = PersistentQueue(user_config_dir() / "queue.sqlite3")
+    resume_batch_id: int | None = None
+    active_control: JobControl | None = None
+    import_cancels: set[threading.Event] = set()
 
     title = ft.Text("CONVERSOR DE VIDEO", size=30, weight=ft.FontWeight.BOLD)
     subtitle = ft.Text(
@@ -114,11 +168,20 @@ def app_main(page: ft.Page):
 
     output_dir_text = ft.Text("Pasta de saida: mesma pasta de cada video.")
     queue_count_text = ft.Text("Fila: 0 video(s)")
-    queue_view = ft.ListView(height=40, spacing=4, visible=False)
-    remove_item_dropdown = ft.Dropdown(label="Item da fila", width=300, options=[])
+    queue_view = ft.ListView(height=40, item_extent=QUEUE_ROW_HEIGHT, visible=False, scroll_interval=100)
+    selected_item_text = ft.Text("Item da fila: clique em um video da lista", width=300)
     queue_action_btn_style = ft.ButtonStyle(shape=ft.RoundedRectangleBorder(radius=4))
     remove_item_button = ft.OutlinedButton("Remover item", style=queue_action_btn_style)
     clear_queue_button = ft.OutlinedButton("Limpar fila", style=queue_action_btn_style)
+    priority_dropdown = ft.Dropdown(
+        label="Prioridade do item",
+        value="Normal",
+        options=[ft.dropdown.Option(name) for name in PRIORITY_LEVELS.keys()],
+        width=150,
+    )
+    set_priority_button = ft.OutlinedButton("Definir prioridade", style=queue_action_btn_style)
+    pause_item_button = ft.OutlinedButton("Pausar/retomar item", style=queue_action_btn_style, disabled=True)
+    cancel_item_button = ft.OutlinedButton("Cancelar item", style=queue_action_btn_style, disabled=True)
     clear_all_button = ft.OutlinedButton("Limpar tudo", style=queue_action_btn_style)
 
     format_dropdown = ft.Dropdown(
@@ -151,6 +214,89 @@ def app_main(page: ft.Page):
         options=[ft.dropdown.Option(name) for name in DVD_TARGET_PRESETS.keys()],
         width=220,
     )
+    dvd_medium_dropdown = ft.Dropdown(
+        label="Midia do DVD",
+        value=DEFAULT_DVD_MEDIUM,
+        tooltip="Calcula o bitrate de video para preencher o disco sem ultrapassar a capacidade",
+        options=[ft.dropdown.Option(name) for name in DVD_MEDIA.keys()],
+        width=180,
+    )
+    cpu_cores = os.cpu_count() or 1
+    workers_dropdown = ft.Dropdown(
+        label="Jobs simultaneos",
+        value="1",
+        options=[ft.dropdown.Option(str(n)) for n in (1, 2, 4, 8, 16, 32) if n <= cpu_cores],
+        width=150,
+    )
+    split_dropdown = ft.Dropdown(
+        label="Segmentos paralelos",
+        value="1",
+        tooltip="Divide videos longos em segmentos codificados em paralelo",
+        options=[ft.dropdown.Option(str(n)) for n in (1, 2, 4, 8, 16) if n <= cpu_cores],
+        width=150,
+    )
+    speed_dropdown = ft.Dropdown(
+        label="Velocidade",
+        value=DEFAULT_SPEED_PROFILE,
+        options=[ft.dropdown.Option(name) for name in [*SPEED_PROFILES.keys(), AUTO_SPEED_PROFILE]],
+        width=150,
+    )
+    target_fps_field = ft.TextField(
+        label="Meta de fps (auto)",
+        width=150,
+        keyboard_type=ft.KeyboardType.NUMBER,
+    )
+    deadline_field = ft.TextField(
+        label="Prazo da fila em horas (auto)",
+        width=220,
+        keyboard_type=ft.KeyboardType.NUMBER,
+    )
+    scratch_dir_field = ft.TextField(
+        label="Pasta local de trabalho (fontes em rede)",
+        tooltip="Copia cada video para esta pasta antes de converter e move a saida em segundo plano",
+        width=300,
+    )
+    include_field = ft.TextField(
+        label="Incluir na importacao (ex.: *.mp4; aulas/*)",
+        width=300,
+    )
+    exclude_field = ft.TextField(
+        label="Excluir da importacao (ex.: *trailer*; lixo)",
+        width=300,
+    )
+    scratch_budget_field = ft.TextField(
+        label="Limite da pasta local em GB",
+        value="20",
+        width=200,
+        keyboard_type=ft.KeyboardType.NUMBER,
+    )
+    quality_metric_dropdown = ft.Dropdown(
+        label="Meta de qualidade",
+        value="Desativada",
+        tooltip="Busca por amostras o maior CRF que atinge a meta e converte uma vez com ele",
+        options=[ft.dropdown.Option(name) for name in ["Desativada", *QUALITY_METRICS.keys()]],
+        width=180,
+    )
+    quality_target_field = ft.TextField(
+        label="Valor da meta (ex.: VMAF 93)",
+        width=200,
+        keyboard_type=ft.KeyboardType.NUMBER,
+    )
+    scheduling_dropdown = ft.Dropdown(
+        label="Ordem de execucao",
+        value=DEFAULT_SCHEDULING_POLICY,
+        options=[ft.dropdown.Option(name) for name in SCHEDULING_POLICIES.keys()],
+        width=220,
+    )
+    ladder_dropdown = ft.Dropdown(
+        label="Escada de resolucoes",
+        value="Desativada",
+        tooltip="Gera varias resolucoes de cada video decodificando uma unica vez",
+        options=[ft.dropdown.Option(name) for name in LADDER_PRESETS.keys()],
+        width=220,
+    )
+    stream_copy_checkbox = ft.Checkbox(label="Copiar streams quando nao precisar recodificar", value=True)
+    dvd_two_pass_checkbox = ft.Checkbox(label="DVD em duas passagens (bitrate mais preciso)", value=False)
 
     progress = ft.ProgressBar(width=440, value=0)
     status_text = ft.Text("Aguardando ação.", selectable=True)
@@ -161,6 +307,12 @@ def app_main(page: ft.Page):
         tooltip="Adicionar videos",
         style=ft.ButtonStyle(shape=ft.RoundedRectangleBorder(radius=7)),
     )
+    import_folder_button = ft.IconButton(
+        icon=ft.Icons.CREATE_NEW_FOLDER,
+        icon_size=22,
+        tooltip="Adicionar pasta (com subpastas)",
+        style=ft.ButtonStyle(shape=ft.RoundedRectangleBorder(radius=7)),
+    )
     pick_output_button = ft.IconButton(
         icon=ft.Icons.FOLDER_OPEN,
         icon_size=22,
@@ -173,6 +325,20 @@ def app_main(page: ft.Page):
         tooltip="Usar pasta de cada video",
         style=ft.ButtonStyle(shape=ft.RoundedRectangleBorder(radius=7)),
     )
+    validate_button = ft.IconButton(
+        icon=ft.Icons.FACT_CHECK,
+        icon_size=22,
+        tooltip="Validar fila sem converter",
+        disabled=not ffmpeg_ok,
+        style=ft.ButtonStyle(shape=ft.RoundedRectangleBorder(radius=7)),
+    )
+    predict_button = ft.IconButton(
+        icon=ft.Icons.TIMER,
+        icon_size=22,
+        tooltip="Estimar tempo e tamanho com amostras",
+        disabled=not ffmpeg_ok,
+        style=ft.ButtonStyle(shape=ft.RoundedRectangleBorder(radius=7)),
+    )
     convert_button = ft.IconButton(
         icon=ft.Icons.PLAY_ARROW,
         icon_size=22,
@@ -187,6 +353,13 @@ def app_main(page: ft.Page):
         disabled=True,
         style=ft.ButtonStyle(shape=ft.RoundedRectangleBorder(radius=7)),
     )
+    pause_button = ft.IconButton(
+        icon=ft.Icons.PAUSE,
+        icon_size=22,
+        tooltip="Pausar fila",
+        disabled=True,
+        style=ft.ButtonStyle(shape=ft.RoundedRectangleBorder(radius=7)),
+    )
     create_video_ts_button = ft.IconButton(
         icon=ft.Icons.SAVE,
         icon_size=22,
@@ -194,6 +367,13 @@ def app_main(page: ft.Page):
         disabled=True,
         style=ft.ButtonStyle(shape=ft.RoundedRectangleBorder(radius=7)),
     )
+    stream_dvd_button = ft.IconButton(
+        icon=ft.Icons.ALBUM,
+        icon_size=22,
+        tooltip="Gerar DVD direto da fila (sem .mpg intermediarios)",
+        disabled=True,
+        style=ft.ButtonStyle(shape=ft.RoundedRectangleBorder(radius=7)),
+    )
     theme_button = ft.IconButton(
         icon=ft.Icons.DARK_MODE,
         icon_size=22,
@@ -223,23 +403,78 @@ def app_main(page: ft.Page):
     def update_ui():
         page.update()
 
-    def refresh_queue():
-        queue_view.controls.clear()
-        remove_item_dropdown.options = []
-        for idx, video in enumerate(selected_videos, start=1):
-            queue_view.controls.append(ft.Text(f"{idx}. {video}"))
-            remove_item_dropdown.options.append(ft.dropdown.Option(str(idx), f"{idx}. {video.name}"))
+    def queue_row_label(position: int, video: Path) -> str:
+        priority = item_priorities.get(video, PRIORITY_LEVELS["Normal"])
+        if priority == PRIORITY_LEVELS["Normal"]:
+            return f"{position + 1}. {video}"
+        priority_names = {level: name for name, level in PRIORITY_LEVELS.items()}
+        return f"{position + 1}. {video} [{priority_names[priority]}]"
+
+    def make_queue_row(position: int, video: Path) -> ft.Container:
+        return ft.Container(
+            content=ft.Text(queue_row_label(position, video), no_wrap=True, color=status_text.color),
+            data=video,
+            on_click=lambda _: select_queue_item(video),
+            bgcolor=rgba("#808080", 0.25) if video == selected_item else None,
+        )
+
+    def relabel_rows(start: int):
+        for position in range(start, len(queue_view.controls)):
+            row = queue_view.controls[position]
+            row.content.value = queue_row_label(position, row.data)
+
+    def render_rows(limit: int):
+        with selected_videos.lock:
+            shown = len(queue_view.controls)
+            for offset, video in enumerate(selected_videos.window(shown, limit)):
+                queue_view.controls.append(make_queue_row(shown + offset, video))
+
+    def on_queue_scroll(e):
+        if e.max_scroll_extent - e.pixels > QUEUE_PAGE_ROWS // 4 * QUEUE_ROW_HEIGHT:
+            return
+        with selected_videos.lock:
+            shown = len(queue_view.controls)
+            if shown >= len(selected_videos):
+                return
+            render_rows(shown + QUEUE_PAGE_ROWS)
+        queue_view.update()
+
+    queue_view.on_scroll = on_queue_scroll
+
+    def select_queue_item(video: Path | None):
+        nonlocal selected_item
+        with selected_videos.lock:
+            for path in [selected_item, video]:
+                if path in selected_videos and selected_videos.index(path) < len(queue_view.controls):
+                    queue_view.controls[selected_videos.index(path)].bgcolor = (
+                        rgba("#808080", 0.25) if path == video else None
+                    )
+        selected_item = video
+        selected_item_text.value = (
+            f"Item da fila: {video.name}" if video else "Item da fila: clique em um video da lista"
+        )
+        update_ui()
+
+    def on_queue_changed(event: str, index: int, paths: list[Path]):
+        nonlocal selected_item
+        if event == "added":
+            render_rows(max(QUEUE_PAGE_ROWS, len(queue_view.controls)))
+        elif event == "removed" and index < len(queue_view.controls):
+            shown = len(queue_view.controls)
+            del queue_view.controls[index]
+            relabel_rows(index)
+            render_rows(shown)
+        elif event == "cleared":
+            queue_view.controls.clear()
+        if selected_item is not None and selected_item not in selected_videos:
+            selected_item = None
+            selected_item_text.value = "Item da fila: clique em um video da lista"
         queue_view.visible = len(selected_videos) > 0
         if queue_view.visible:
-            queue_view.height = min(130, max(40, len(selected_videos) * 24))
-        if selected_videos:
-            selected_value = remove_item_dropdown.value
-            valid_values = {str(i) for i in range(1, len(selected_videos) + 1)}
-            remove_item_dropdown.value = selected_value if selected_value in valid_values else "1"
-        else:
-            remove_item_dropdown.value = None
+            queue_view.height = min(130, max(40, len(selected_videos) * QUEUE_ROW_HEIGHT))
         queue_count_text.value = f"Fila: {len(selected_videos)} video(s)"
-        update_ui()
+
+    selected_videos.subscribe(on_queue_changed)
 
     def set_status(message: str, progress_value: float | None = None, running: bool = False):
         status_text.value = message
@@ -248,10 +483,77 @@ def app_main(page: ft.Page):
         elif progress_value is not None:
             progress.value = progress_value
         convert_button.disabled = running or (not ffmpeg_ok)
+        validate_button.disabled = running or (not ffmpeg_ok)
+        predict_button.disabled = running or (not ffmpeg_ok)
         create_video_ts_button.disabled = running or (not dvdauthor_ok)
+        stream_dvd_button.disabled = running or not (ffmpeg_ok and dvdauthor_ok)
         cancel_button.disabled = not running
+        pause_button.disabled = pause_item_button.disabled = cancel_item_button.disabled = active_control is None
         update_ui()
 
+    def start_progress_relay(control: JobControl | None = None):
+        start_ts = time.monotonic()
+        latest = {"message": None, "value": None, "done": None, "total": None, "dirty": False}
+        latest_lock = threading.Lock()
+        stop_relay = threading.Event()
+
+        def on_progress(
+            message: str,
+            progress_value: float | None,
+            done: int | None,
+            total: int | None,
+        ):
+            with latest_lock:
+                latest.update(message=message, value=progress_value, done=done, total=total, dirty=True)
+
+        def flush():
+            with latest_lock:
+                message = latest["message"]
+                progress_value = latest["value"]
+                done = latest["done"]
+                total = latest["total"]
+                value_changed = latest["dirty"]
+                latest["dirty"] = False
+            if message is None:
+                return
+            elapsed = time.monotonic() - start_ts
+            status_with_time = f"{message}\nTempo decorrido: {format_seconds(elapsed)}"
+            if progress_value and 0 < progress_value < 1:
+                eta_seconds = elapsed * (1 - progress_value) / progress_value
+                status_with_time += f" | Tempo restante: {format_seconds(eta_seconds)}"
+            elif done is not None and total and done > 0:
+                avg_per_item = elapsed / done
+                remaining_items = max(total - done, 0)
+                eta_seconds = avg_per_item * remaining_items
+                status_with_time += f" | Tempo restante: {format_seconds(eta_seconds)}"
+            if control and control.paused:
+                status_with_time += "\nFila pausada: os encodes em andamento estao suspensos."
+            elif control:
+                paused_items = [
+                    key.name for key in control.running_keys() if (item := control.find(key)) and item.paused
+                ]
+                if paused_items:
+                    status_with_time += "\nPausado(s): " + ", ".join(paused_items)
+            if status_text.value != status_with_time:
+                status_text.value = status_with_time
+                status_text.update()
+            if value_changed and progress.value != progress_value:
+                progress.value = progress_value
+                progress.update()
+
+        def relay():
+            while not stop_relay.wait(UI_REFRESH_SECONDS):
+                flush()
+
+        relay_thread = threading.Thread(target=relay, daemon=True)
+        relay_thread.start()
+
+        def stop():
+            stop_relay.set()
+            relay_thread.join()
+
+        return on_progress, stop
+
     def set_window_position(left: int, top: int):
         window_pos["left"] = left
         window_pos["top"] = top
@@ -278,20 +580,34 @@ def app_main(page: ft.Page):
         subtitle.color = header_fg
         output_dir_text.color = body_fg
         queue_count_text.color = body_fg
+        selected_item_text.color = body_fg
+        for row in queue_view.controls:
+            row.content.color = body_fg
         status_text.color = body_fg
+        stream_copy_checkbox.label_style = ft.TextStyle(color=body_fg)
+        dvd_two_pass_checkbox.label_style = ft.TextStyle(color=body_fg)
+        for field in [target_fps_field, deadline_field, quality_target_field, scratch_dir_field, scratch_budget_field, include_field, exclude_field]:
+            field.label_style = ft.TextStyle(color=body_fg)
+            field.text_style = ft.TextStyle(color=body_fg)
+            field.border_color = body_fg
 
-        for dd in [remove_item_dropdown, format_dropdown, codec_dropdown, quality_dropdown, resolution_dropdown, dvd_profile_dropdown]:
+        for dd in [format_dropdown, codec_dropdown, quality_dropdown, resolution_dropdown, dvd_profile_dropdown, dvd_medium_dropdown, workers_dropdown, split_dropdown, ladder_dropdown, speed_dropdown, scheduling_dropdown, priority_dropdown, quality_metric_dropdown]:
             dd.label_style = ft.TextStyle(color=body_fg)
             dd.text_style = ft.TextStyle(color=body_fg)
             dd.border_color = body_fg
 
         for btn in [
             add_videos_button,
+            import_folder_button,
             pick_output_button,
             clear_output_button,
+            validate_button,
+            predict_button,
             convert_button,
             cancel_button,
+            pause_button,
             create_video_ts_button,
+            stream_dvd_button,
             theme_button,
             minimize_button,
             move_button,
@@ -316,21 +632,41 @@ def app_main(page: ft.Page):
         )
         if not files:
             return
+        added: list[Path] = []
         for f in files:
             if not f.path:
                 continue
             path = Path(f.path)
-            if path.suffix.lower() in VIDEO_EXTENSIONS and path not in selected_videos:
-                selected_videos.append(path)
-        refresh_queue()
+            if path.suffix.lower() in VIDEO_EXTENSIONS:
+                added.append(path)
+        added = selected_videos.add_many(added)
+        if added:
+            update_ui()
+            threading.Thread(target=probe_media_many, args=(added,), daemon=True).start()
+
+    def discard_resume_batch():
+        nonlocal resume_batch_id
+        if resume_batch_id is not None:
+            job_queue.close_batch(resume_batch_id, "discarded")
+            resume_batch_id = None
+
+    def cancel_imports():
+        for event in list(import_cancels):
+            event.set()
 
     def clear_queue(_):
+        cancel_imports()
         selected_videos.clear()
-        refresh_queue()
+        item_priorities.clear()
+        discard_resume_batch()
+        update_ui()
 
     def clear_all(_):
         nonlocal selected_output_dir
+        cancel_imports()
         selected_videos.clear()
+        discard_resume_batch()
+        item_priorities.clear()
         selected_output_dir = None
         output_dir_text.value = "Pasta de saida: mesma pasta de cada video."
         format_dropdown.value = "mp4"
@@ -338,25 +674,108 @@ def app_main(page: ft.Page):
         quality_dropdown.value = "Media (CRF 23)"
         resolution_dropdown.value = "Original"
         dvd_profile_dropdown.value = "Desativado"
+        dvd_medium_dropdown.value = DEFAULT_DVD_MEDIUM
+        dvd_two_pass_checkbox.value = False
+        workers_dropdown.value = "1"
+        split_dropdown.value = "1"
+        ladder_dropdown.value = "Desativada"
+        scheduling_dropdown.value = DEFAULT_SCHEDULING_POLICY
+        priority_dropdown.value = "Normal"
+        speed_dropdown.value = DEFAULT_SPEED_PROFILE
+        target_fps_field.value = ""
+        deadline_field.value = ""
+        scratch_dir_field.value = ""
+        scratch_budget_field.value = "20"
+        include_field.value = ""
+        quality_metric_dropdown.value = "Desativada"
+        quality_target_field.value = ""
+        exclude_field.value = ""
+        stream_copy_checkbox.value = True
         progress.value = 0
         set_status("Tudo limpo.", progress_value=0, running=False)
-        refresh_queue()
 
     def remove_selected_item(_):
         if not selected_videos:
             set_status("A fila esta vazia.", progress_value=0)
             return
-        if not remove_item_dropdown.value:
+        if selected_item is None:
             set_status("Selecione um item da fila para remover.", progress_value=0)
             return
-        idx = int(remove_item_dropdown.value) - 1
-        if idx < 0 or idx >= len(selected_videos):
-            set_status("Item selecionado invalido.", progress_value=0)
-            return
-        removed = selected_videos.pop(idx)
-        refresh_queue()
+        removed = selected_item
+        selected_videos.remove(removed)
+        item_priorities.pop(removed, None)
         set_status(f"Removido da fila: {removed.name}", progress_value=0)
 
+    def set_selected_priority(_):
+        if selected_item is None:
+            set_status("Selecione um item da fila para definir a prioridade.", progress_value=0)
+            return
+        name = priority_dropdown.value or "Normal"
+        item_priorities[selected_item] = PRIORITY_LEVELS[name]
+        with selected_videos.lock:
+            position = selected_videos.index(selected_item)
+            if position < len(queue_view.controls):
+                queue_view.controls[position].content.value = queue_row_label(position, selected_item)
+        set_status(f"Prioridade {name} para: {selected_item.name}", progress_value=0)
+
+    def import_folder_worker(root: Path, include: list[str], exclude: list[str]):
+        imported: list[Path] = []
+        import_cancel = threading.Event()
+        import_cancels.add(import_cancel)
+
+        async def apply_found(paths: list[Path]):
+            if import_cancel.is_set():
+                return
+            added = selected_videos.add_many(paths)
+            if added:
+                imported.extend(added)
+                queue_count_text.value = f"Fila: {len(selected_videos)} video(s) | importando {root.name}..."
+                update_ui()
+
+        def on_found(paths: list[Path]):
+            page.run_task(apply_found, list(paths))
+
+        from folder_import import import_folder
+
+        status_text.value = f"Importando {root}..."
+        cancel_button.disabled = False
+        update_ui()
+        try:
+            found, rejected = import_folder(root, on_found, include, exclude, cancel_check=import_cancel.is_set)
+        finally:
+            import_cancels.discard(import_cancel)
+
+        async def finish_import():
+            queue_count_text.value = f"Fila: {len(selected_videos)} video(s)"
+            if import_cancel.is_set():
+                set_status(
+                    f"Importacao de {root} cancelada: {len(imported)} video(s) adicionados.",
+                    progress_value=0,
+                    running=active_control is not None,
+                )
+            else:
+                set_status(
+                    f"Importacao de {root}: {len(imported)} video(s) adicionados, "
+                    f"{found - len(imported)} ja na fila, {rejected} arquivo(s) ignorados por nao serem video.",
+                    progress_value=0,
+                    running=active_control is not None,
+                )
+            threading.Thread(target=probe_media_many, args=(list(imported),), daemon=True).start()
+
+        page.run_task(finish_import)
+
+    async def pick_import_folder(_):
+        chosen_dir = await dir_picker.get_directory_path(dialog_title="Selecione a pasta a importar")
+        if not chosen_dir:
+            return
+        include = [pattern.strip() for pattern in (include_field.value or "").split(";") if pattern.strip()]
+        exclude = [pattern.strip() for pattern in (exclude_field.value or "").split(";") if pattern.strip()]
+        threading.Thread(
+            target=import_folder_worker,
+            args=(Path(chosen_dir), include, exclude),
+            daemon=True,
+        ).start()
+
     async def pick_output_dir(_):
         nonlocal selected_output_dir
         chosen_dir = await dir_picker.get_directory_path(dialog_title="Selecione a pasta de saida")
@@ -374,45 +793,249 @@ def app_main(page: ft.Page):
         output_dir_text.value = "Pasta de saida: mesma pasta de cada video."
         update_ui()
 
+    def parse_positive(value: str | None) -> float | None:
+        try:
+            number = float((value or "").replace(",", "."))
+        except ValueError:
+            return None
+        return number if number > 0 else None
+
+    def current_settings() -> dict:
+        return {
+            "format": format_dropdown.value,
+            "codec": codec_dropdown.value,
+            "quality": quality_dropdown.value,
+            "resolution": resolution_dropdown.value,
+            "dvd": dvd_profile_dropdown.value,
+            "dvd_medium": dvd_medium_dropdown.value,
+            "dvd_two_pass": bool(dvd_two_pass_checkbox.value),
+            "workers": workers_dropdown.value,
+            "split": split_dropdown.value,
+            "ladder": ladder_dropdown.value,
+            "speed": speed_dropdown.value,
+            "scheduling": scheduling_dropdown.value,
+            "quality_metric": quality_metric_dropdown.value,
+            "quality_target": quality_target_field.value or "",
+            "stream_copy": bool(stream_copy_checkbox.value),
+            "scratch_dir": scratch_dir_field.value or "",
+            "scratch_budget": scratch_budget_field.value or "",
+            "output_dir": str(selected_output_dir) if selected_output_dir else None,
+        }
+
+    def apply_settings(settings: dict):
+        nonlocal selected_output_dir
+        for key, dd in [
+            ("format", format_dropdown),
+            ("codec", codec_dropdown),
+            ("quality", quality_dropdown),
+            ("resolution", resolution_dropdown),
+            ("dvd", dvd_profile_dropdown),
+            ("dvd_medium", dvd_medium_dropdown),
+            ("workers", workers_dropdown),
+            ("split", split_dropdown),
+            ("ladder", ladder_dropdown),
+            ("speed", speed_dropdown),
+            ("scheduling", scheduling_dropdown),
+            ("quality_metric", quality_metric_dropdown),
+        ]:
+            value = settings.get(key)
+            if value and any(option.key == value for option in dd.options):
+                dd.value = value
+        stream_copy_checkbox.value = settings.get("stream_copy", True)
+        dvd_two_pass_checkbox.value = settings.get("dvd_two_pass", False)
+        scratch_dir_field.value = settings.get("scratch_dir", "")
+        quality_target_field.value = settings.get("quality_target", "")
+        scratch_budget_field.value = settings.get("scratch_budget") or "20"
+        if settings.get("output_dir"):
+            selected_output_dir = Path(settings["output_dir"])
+            output_dir_text.value = f"Pasta de saida: {selected_output_dir}"
+
+    def restore_interrupted_batch():
+        nonlocal resume_batch_id
+        interrupted = job_queue.interrupted_batch()
+        if interrupted is None:
+            return
+        batch_id, settings, pending, finished = interrupted
+        pending = [path for path in pending if path.exists()]
+        if not pending:
+            job_queue.close_batch(batch_id, "done")
+            return
+        resume_batch_id = batch_id
+        apply_settings(settings)
+        output_dir = Path(settings["output_dir"]) if settings.get("output_dir") else None
+        for path in pending:
+            remove_stale_partials(path, output_dir)
+        selected_videos.add_many(pending)
+        status_text.value = (
+            f"Fila interrompida restaurada: {len(pending)} video(s) pendente(s), "
+            f"{finished} ja concluido(s). Clique em converter para continuar."
+        )
+        update_ui()
+
     def convert_worker():
-        start_ts = time.monotonic()
+        nonlocal resume_batch_id, active_control
+        control = JobControl()
+        batch_id: int | None = None
+        batch_status = "failed"
+        summary = ""
+        try:
+            if resume_batch_id is not None:
+                job_queue.close_batch(resume_batch_id, "resumed")
+                resume_batch_id = None
+            batch_id = job_queue.create_batch(current_settings(), selected_videos)
+            active_control = control
 
-        def format_seconds(seconds: float) -> str:
-            sec = max(0, int(seconds))
-            h = sec // 3600
-            m = (sec % 3600) // 60
-            s = sec % 60
-            if h > 0:
-                return f"{h:02d}:{m:02d}:{s:02d}"
-            return f"{m:02d}:{s:02d}"
+            def on_job_done(source_file: Path, ok: bool, message: str):
+                if not message.startswith("CANCELADO"):
+                    job_queue.mark_finished(batch_id, source_file, ok, message)
 
-        def on_progress(
-            message: str,
-            progress_value: float | None,
-            done: int | None,
-            total: int | None,
-        ):
-            elapsed = time.monotonic() - start_ts
-            status_with_time = f"{message}\nTempo decorrido: {format_seconds(elapsed)}"
-            if done is not None and total and done > 0:
-                avg_per_item = elapsed / done
-                remaining_items = max(total - done, 0)
-                eta_seconds = avg_per_item * remaining_items
-                status_with_time += f" | Tempo restante: {format_seconds(eta_seconds)}"
-            set_status(status_with_time, progress_value=progress_value, running=True)
+            output_format = format_dropdown.value or "mp4"
+            codec_name = codec_dropdown.value or "H.265 (HEVC)"
+            quality_name = quality_dropdown.value or "Media (CRF 23)"
+            quality_metric = quality_metric_dropdown.value if quality_metric_dropdown.value in QUALITY_METRICS else None
+            quality_target = (
+                parse_positive(quality_target_field.value) or QUALITY_TARGET_DEFAULTS[quality_metric] if quality_metric else None
+            )
+            set_status("Preparando conversao...", progress_value=None, running=True)
+            on_progress, stop_relay = start_progress_relay(control)
+            try:
+                summary = convert_video_queue(
+                    selected_videos=selected_videos,
+                    selected_output_dir=selected_output_dir,
+                    output_format=output_format,
+                    codec_name=codec_name,
+                    quality_name=quality_name,
+                    resolution_name=resolution_dropdown.value or "Original",
+                    dvd_profile_name=dvd_profile_dropdown.value or "Desativado",
+                    progress_callback=on_progress,
+                    cancel_check=control,
+                    max_workers=int(workers_dropdown.value or "1"),
+                    allow_stream_copy=bool(stream_copy_checkbox.value),
+                    split_workers=int(split_dropdown.value or "1"),
+                    event_log=job_event_log,
+                    renditions=build_ladder_renditions(
+                        ladder_dropdown.value or "Desativada",
+                        output_format,
+                        codec_name,
+                        quality_name,
+                    ),
+                    speed_profile=speed_dropdown.value or DEFAULT_SPEED_PROFILE,
+                    target_fps=parse_positive(target_fps_field.value),
+                    deadline_seconds=(parse_positive(deadline_field.value) or 0) * 3600 or None,
+                    scheduling_policy=scheduling_dropdown.value or DEFAULT_SCHEDULING_POLICY,
+                    priorities=dict(item_priorities),
+                    enqueue_times=selected_videos.added_times(),
+                    job_callback=on_job_done,
+                    scratch_dir=Path(scratch_dir_field.value.strip()) if (scratch_dir_field.value or "").strip() else None,
+                    scratch_budget_bytes=int((parse_positive(scratch_budget_field.value) or 20) * 1024**3),
+                    predictions=last_prediction["values"] if last_prediction["settings"] == prediction_settings() else None,
+                    quality_metric=quality_metric,
+                    quality_target=quality_target,
+                    dvd_medium=dvd_medium_dropdown.value or DEFAULT_DVD_MEDIUM,
+                    dvd_two_pass=bool(dvd_two_pass_checkbox.value),
+                )
+            finally:
+                stop_relay()
+            batch_status = "canceled" if control.canceled else "done"
+        except Exception as exc:
+            summary = f"Falha inesperada na conversao:\n{type(exc).__name__}: {exc}"
+        finally:
+            active_control = None
+            pause_button.icon = ft.Icons.PAUSE
+            pause_button.tooltip = "Pausar fila"
+            if batch_id is not None:
+                try:
+                    job_queue.close_batch(batch_id, batch_status)
+                except Exception as exc:
+                    summary += f"\nNao foi possivel registrar o fim da fila: {exc}"
+            set_status(
+                summary,
+                progress_value=1 if selected_videos and batch_status != "failed" else 0,
+                running=False,
+            )
 
-        summary = convert_video_queue(
+    def validate_worker():
+        output_format = format_dropdown.value or "mp4"
+        codec_name = codec_dropdown.value or "H.265 (HEVC)"
+        report = preflight_report(
             selected_videos=selected_videos,
             selected_output_dir=selected_output_dir,
-            output_format=format_dropdown.value or "mp4",
-            codec_name=codec_dropdown.value or "H.265 (HEVC)",
-            quality_name=quality_dropdown.value or "Media (CRF 23)",
+            output_format=output_format,
+            codec_name=codec_name,
             resolution_name=resolution_dropdown.value or "Original",
             dvd_profile_name=dvd_profile_dropdown.value or "Desativado",
-            progress_callback=on_progress,
-            cancel_check=cancel_event.is_set,
+            renditions=build_ladder_renditions(
+                ladder_dropdown.value or "Desativada",
+                output_format,
+                codec_name,
+                quality_dropdown.value or "Media (CRF 23)",
+            ),
+            allow_stream_copy=bool(stream_copy_checkbox.value),
+            predictions=last_prediction["values"] if last_prediction["settings"] == prediction_settings() else None,
+            dvd_medium=dvd_medium_dropdown.value or DEFAULT_DVD_MEDIUM,
+        )
+        set_status(report, progress_value=0, running=False)
+
+    def start_validation(_):
+        if not selected_videos:
+            set_status("Adicione videos na fila antes de validar.", progress_value=0)
+            return
+        set_status("Validando a fila...", progress_value=None, running=True)
+        threading.Thread(target=validate_worker, daemon=True).start()
+
+    def prediction_settings() -> tuple:
+        return (
+            format_dropdown.value,
+            codec_dropdown.value,
+            quality_dropdown.value,
+            resolution_dropdown.value,
+            dvd_profile_dropdown.value,
+            ladder_dropdown.value,
+            speed_dropdown.value,
+            workers_dropdown.value,
+            bool(stream_copy_checkbox.value),
         )
-        set_status(summary, progress_value=1 if selected_videos else 0, running=False)
+
+    def predict_worker():
+        output_format = format_dropdown.value or "mp4"
+        codec_name = codec_dropdown.value or "H.265 (HEVC)"
+        quality_name = quality_dropdown.value or "Media (CRF 23)"
+        settings = prediction_settings()
+        max_workers = int(workers_dropdown.value or "1")
+        on_progress, stop_relay = start_progress_relay()
+        try:
+            predictions = predict_queue(
+                selected_videos=selected_videos,
+                output_format=output_format,
+                codec_name=codec_name,
+                quality_name=quality_name,
+                resolution_name=resolution_dropdown.value or "Original",
+                dvd_profile_name=dvd_profile_dropdown.value or "Desativado",
+                renditions=build_ladder_renditions(
+                    ladder_dropdown.value or "Desativada",
+                    output_format,
+                    codec_name,
+                    quality_name,
+                ),
+                speed_profile=speed_dropdown.value or DEFAULT_SPEED_PROFILE,
+                max_workers=max_workers,
+                allow_stream_copy=bool(stream_copy_checkbox.value),
+                cancel_check=cancel_event.is_set,
+                progress_callback=on_progress,
+            )
+        finally:
+            stop_relay()
+        last_prediction["settings"] = settings
+        last_prediction["values"] = predictions
+        set_status(predict_report(predictions, len(selected_videos), max_workers), progress_value=0, running=False)
+
+    def start_prediction(_):
+        if not selected_videos:
+            set_status("Adicione videos na fila antes de estimar.", progress_value=0)
+            return
+        cancel_event.clear()
+        set_status("Codificando amostras para estimar tempo e tamanho...", progress_value=None, running=True)
+        threading.Thread(target=predict_worker, daemon=True).start()
 
     def start_conversion(_):
         if not ffmpeg_ok:
@@ -427,8 +1050,48 @@ def app_main(page: ft.Page):
 
     def cancel_conversion(_):
         cancel_event.set()
+        cancel_imports()
+        if active_control:
+            active_control.cancel()
         set_status("Cancelando conversao...", progress_value=None, running=True)
 
+    def toggle_pause(_):
+        control = active_control
+        if control is None:
+            return
+        if control.paused:
+            control.resume()
+            pause_button.icon = ft.Icons.PAUSE
+            pause_button.tooltip = "Pausar fila"
+        else:
+            control.pause()
+            pause_button.icon = ft.Icons.PLAY_ARROW
+            pause_button.tooltip = "Retomar fila"
+        update_ui()
+
+    def selected_running_control() -> JobControl | None:
+        if active_control is None or selected_item is None:
+            return None
+        control = active_control.find(selected_item)
+        if control is None:
+            selected_item_text.value = f"Item da fila: {selected_item.name} (nao esta convertendo agora)"
+            update_ui()
+        return control
+
+    def toggle_pause_item(_):
+        control = selected_running_control()
+        if control is None:
+            return
+        if control.paused:
+            control.resume()
+        else:
+            control.pause()
+
+    def cancel_selected_item(_):
+        control = selected_running_control()
+        if control is not None:
+            control.cancel()
+
     def create_video_ts_worker():
         set_status("Gerando VIDEO_TS com dvdauthor...", running=True)
         ok, msg = create_video_ts_from_selection(
@@ -448,6 +1111,45 @@ def app_main(page: ft.Page):
         worker = threading.Thread(target=create_video_ts_worker, daemon=True)
         worker.start()
 
+    def stream_dvd_worker():
+        nonlocal active_control
+        from dvd_stream import build_video_ts_streamed
+
+        control = JobControl()
+        active_control = control
+        on_progress, stop_relay = start_progress_relay(control)
+        try:
+            ok, msg = build_video_ts_streamed(
+                selected_videos=list(selected_videos),
+                selected_output_dir=selected_output_dir,
+                dvd_profile_name=dvd_profile_dropdown.value or "DVD NTSC (720x480, 29.97fps)",
+                max_workers=int(workers_dropdown.value or "1"),
+                progress_callback=on_progress,
+                cancel_check=control,
+                dvd_medium=dvd_medium_dropdown.value or DEFAULT_DVD_MEDIUM,
+                two_pass=bool(dvd_two_pass_checkbox.value),
+            )
+        finally:
+            stop_relay()
+            active_control = None
+            pause_button.icon = ft.Icons.PAUSE
+            pause_button.tooltip = "Pausar fila"
+        if ok:
+            set_status(msg, progress_value=1, running=False)
+        else:
+            set_status(f"Falha ao gerar o DVD:\n{msg}", progress_value=0, running=False)
+
+    def start_stream_dvd(_):
+        if not (ffmpeg_ok and dvdauthor_ok):
+            set_status("Instale o FFmpeg e o dvdauthor e adicione ao PATH.", progress_value=0)
+            return
+        if not selected_videos:
+            set_status("Adicione videos na fila antes de gerar o DVD.", progress_value=0)
+            return
+        cancel_event.clear()
+        set_status("Gerando DVD direto da fila...", progress_value=None, running=True)
+        threading.Thread(target=stream_dvd_worker, daemon=True).start()
+
     def toggle_theme(_):
         if page.theme_mode == ft.ThemeMode.DARK:
             page.theme_mode = ft.ThemeMode.LIGHT
@@ -555,28 +1257,41 @@ def app_main(page: ft.Page):
         if not closed:
             os._exit(0)
 
+    validate_button.on_click = start_validation
+    predict_button.on_click = start_prediction
     convert_button.on_click = start_conversion
     cancel_button.on_click = cancel_conversion
+    pause_button.on_click = toggle_pause
+    pause_item_button.on_click = toggle_pause_item
+    cancel_item_button.on_click = cancel_selected_item
     create_video_ts_button.on_click = start_create_video_ts
+    stream_dvd_button.on_click = start_stream_dvd
     theme_button.on_click = toggle_theme
     minimize_button.on_click = minimize_app
     move_button.on_click = move_app
     close_button.on_click = close_app
     add_videos_button.on_click = pick_videos
+    import_folder_button.on_click = pick_import_folder
     pick_output_button.on_click = pick_output_dir
     clear_output_button.on_click = clear_output_dir
     remove_item_button.on_click = remove_selected_item
+    set_priority_button.on_click = set_selected_priority
     clear_queue_button.on_click = clear_queue
     clear_all_button.on_click = clear_all
 
     navbar_row = ft.Row(
         [
             ft.Container(content=add_videos_button, expand=1, alignment=ft.Alignment(0, 0)),
+            ft.Container(content=import_folder_button, expand=1, alignment=ft.Alignment(0, 0)),
             ft.Container(content=pick_output_button, expand=1, alignment=ft.Alignment(0, 0)),
             ft.Container(content=clear_output_button, expand=1, alignment=ft.Alignment(0, 0)),
+            ft.Container(content=validate_button, expand=1, alignment=ft.Alignment(0, 0)),
+            ft.Container(content=predict_button, expand=1, alignment=ft.Alignment(0, 0)),
             ft.Container(content=convert_button, expand=1, alignment=ft.Alignment(0, 0)),
             ft.Container(content=cancel_button, expand=1, alignment=ft.Alignment(0, 0)),
+            ft.Container(content=pause_button, expand=1, alignment=ft.Alignment(0, 0)),
             ft.Container(content=create_video_ts_button, expand=1, alignment=ft.Alignment(0, 0)),
+            ft.Container(content=stream_dvd_button, expand=1, alignment=ft.Alignment(0, 0)),
             ft.Container(content=theme_button, expand=1, alignment=ft.Alignment(0, 0)),
             ft.Container(content=minimize_button, expand=1, alignment=ft.Alignment(0, 0)),
             ft.Container(content=move_button, expand=1, alignment=ft.Alignment(0, 0)),
@@ -611,7 +1326,8 @@ def app_main(page: ft.Page):
                 ft.Divider(),
                 ft.Row(
                     [
-                        remove_item_dropdown,
+                        selected_item_text,
+                        priority_dropdown,
                         queue_count_text,
                     ],
                     wrap=True,
@@ -619,6 +1335,9 @@ def app_main(page: ft.Page):
                 ft.Row(
                     [
                         remove_item_button,
+                        set_priority_button,
+                        pause_item_button,
+                        cancel_item_button,
                         clear_queue_button,
                         clear_all_button,
                     ],
@@ -633,9 +1352,25 @@ def app_main(page: ft.Page):
                         quality_dropdown,
                         resolution_dropdown,
                         dvd_profile_dropdown,
+                        dvd_medium_dropdown,
+                        workers_dropdown,
+                        split_dropdown,
+                        ladder_dropdown,
+                        speed_dropdown,
+                        scheduling_dropdown,
+                        quality_metric_dropdown,
+                        quality_target_field,
+                        target_fps_field,
+                        deadline_field,
+                        scratch_dir_field,
+                        scratch_budget_field,
+                        include_field,
+                        exclude_field,
                     ],
                     wrap=True,
                 ),
+                stream_copy_checkbox,
+                dvd_two_pass_checkbox,
                 progress,
                 status_text,
             ],
@@ -652,8 +1387,13 @@ def app_main(page: ft.Page):
         nonlocal ffmpeg_ok, dvdauthor_ok
         ffmpeg_ok = ffmpeg_value
         dvdauthor_ok = dvdauthor_value
+        validate_button.disabled = not ffmpeg_value
+        predict_button.disabled = not ffmpeg_value
+        stream_dvd_button.disabled = not (ffmpeg_value and dvdauthor_value)
         apply_theme_styles()
 
+    restore_interrupted_batch()
+
     page.run_task(
         run_startup_splash,
         splash_step_text,
@@ -664,7 +1404,7 @@ def app_main(page: ft.Page):
         convert_button,
         create_video_ts_button,
         check_ffmpeg,
-        check_dvdauthor,
+        check_dvdauthor_cached,
         update_ui,
         set_startup_flags,
     )
@@ -0,0 +1,171 @@
+from pathlib import Path
+import os
+import signal
+import subprocess
+import threading
+
+
+TERMINATE_GRACE_SECONDS = 3.0
+PROCESS_SUSPEND_RESUME = 0x0800
+
+
+def process_group_kwargs() -> dict:
+    if os.name == "nt":
+        return {"creationflags": subprocess.CREATE_NEW_PROCESS_GROUP}
+    return {"start_new_session": True}
+
+
+def _nt_process_call(function_name: str, pid: int) -> None:
+    import ctypes
+
+    kernel32 = ctypes.windll.kernel32
+    handle = kernel32.OpenProcess(PROCESS_SUSPEND_RESUME, False, pid)
+    if not handle:
+        return
+    try:
+        getattr(ctypes.windll.ntdll, function_name)(handle)
+    finally:
+        kernel32.CloseHandle(handle)
+
+
+def _signal_group(process: subprocess.Popen, sig: int) -> None:
+    try:
+        os.killpg(process.pid, sig)
+    except (ProcessLookupError, PermissionError):
+        pass
+
+
+def suspend_process(process: subprocess.Popen) -> None:
+    if process.poll() is not None:
+        return
+    if os.name == "nt":
+        _nt_process_call("NtSuspendProcess", process.pid)
+    else:
+        _signal_group(process, signal.SIGSTOP)
+
+
+def resume_process(process: subprocess.Popen) -> None:
+    if process.poll() is not None:
+        return
+    if os.name == "nt":
+        _nt_process_call("NtResumeProcess", process.pid)
+    else:
+        _signal_group(process, signal.SIGCONT)
+
+
+def terminate_process(process: subprocess.Popen) -> None:
+    if process.poll() is not None:
+        return
+    if os.name == "nt":
+        process.terminate()
+    else:
+        _signal_group(process, signal.SIGTERM)
+        _signal_group(process, signal.SIGCONT)
+
+    def kill_if_alive() -> None:
+        if process.poll() is None:
+            if os.name == "nt":
+                process.kill()
+            else:
+                _signal_group(process, signal.SIGKILL)
+
+    timer = threading.Timer(TERMINATE_GRACE_SECONDS, kill_if_alive)
+    timer.daemon = True
+    timer.start()
+
+
+class JobControl:
+    def __init__(self, parent: "JobControl | None" = None, key: Path | None = None):
+        self.parent = parent
+        self.key = key
+        self._lock = threading.RLock()
+        self._state_changed = threading.Condition(self._lock)
+        self._canceled = False
+        self._paused = False
+        self._processes: dict[subprocess.Popen, bool] = {}
+        self._children: dict[Path, JobControl] = {}
+
+    def __call__(self) -> bool:
+        return self.canceled
+
+    @property
+    def canceled(self) -> bool:
+        return self._canceled or (self.parent is not None and self.parent.canceled)
+
+    @property
+    def paused(self) -> bool:
+        return self._paused or (self.parent is not None and self.parent.paused)
+
+    def child(self, key: Path) -> "JobControl":
+        control = JobControl(self, key)
+        with self._lock:
+            self._children[key] = control
+        return control
+
+    def find(self, key: Path) -> "JobControl | None":
+        with self._lock:
+            return self._children.get(key)
+
+    def running_keys(self) -> list[Path]:
+        with self._lock:
+            return list(self._children)
+
+    def close(self) -> None:
+        if self.parent is not None:
+            with self.parent._lock:
+                if self.parent._children.get(self.key) is self:
+                    del self.parent._children[self.key]
+
+    def attach(self, process: subprocess.Popen) -> None:
+        with self._lock:
+            self._processes[process] = False
+            if self.canceled:
+                terminate_process(process)
+            elif self.paused:
+                suspend_process(process)
+                self._processes[process] = True
+
+    def detach(self, process: subprocess.Popen) -> None:
+        with self._lock:
+            self._processes.pop(process, None)
+
+    def _sync(self) -> None:
+        with self._lock:
+            paused = self.paused
+            for process, suspended in list(self._processes.items()):
+                if paused and not suspended:
+                    suspend_process(process)
+                elif suspended and not paused:
+                    resume_process(process)
+                self._processes[process] = paused
+            children = list(self._children.values())
+            self._state_changed.notify_all()
+        for control in children:
+            control._sync()
+
+    def pause(self) -> None:
+        self._paused = True
+        self._sync()
+
+    def resume(self) -> None:
+        self._paused = False
+        self._sync()
+
+    def cancel(self) -> None:
+        with self._lock:
+            self._canceled = True
+            processes = list(self._processes)
+            children = list(self._children.values())
+            self._state_changed.notify_all()
+        for process in processes:
+            terminate_process(process)
+        for control in children:
+            control.cancel()
+
+    def wait_while_paused(self) -> None:
+        root = self
+        while root.parent is not None:
+            root = root.parent
+        with root._state_changed:
+            while self.paused and not self.canceled:
+                root._state_changed.wait(0.5)
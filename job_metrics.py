@@ -0,0 +1,138 @@
+from pathlib import Path
+import json
+import os
+import threading
+import time
+
+
+class JobEventLog:
+    def __init__(self, jsonl_file: Path | None, textfile: Path | None = None):
+        self.jsonl_file = jsonl_file
+        self.textfile = textfile
+        self._lock = threading.Lock()
+        self._in_flight = 0
+        self._totals = {
+            "wall_seconds": 0.0,
+            "cpu_seconds": 0.0,
+            "input_bytes": 0,
+            "output_bytes": 0,
+        }
+        self._status_counts: dict[str, int] = {}
+        self._last: dict = {}
+        if jsonl_file:
+            jsonl_file.parent.mkdir(parents=True, exist_ok=True)
+        if textfile:
+            textfile.parent.mkdir(parents=True, exist_ok=True)
+
+    def emit(self, event: str, job_id: str, **fields) -> None:
+        record = {"ts": round(time.time(), 3), "event": event, "job": job_id, **fields}
+        with self._lock:
+            if event == "started":
+                self._in_flight += 1
+            elif event == "finished":
+                self._in_flight = max(0, self._in_flight - 1)
+                self._account(fields)
+            if self.jsonl_file:
+                with self.jsonl_file.open("a", encoding="utf-8") as fh:
+                    fh.write(json.dumps(record, ensure_ascii=False, default=str) + "\n")
+            if self.textfile and event in ("started", "finished"):
+                self._write_textfile()
+
+    def _account(self, fields: dict) -> None:
+        status = fields.get("status", "unknown")
+        self._status_counts[status] = self._status_counts.get(status, 0) + 1
+        for key in self._totals:
+            value = fields.get(key)
+            if isinstance(value, (int, float)):
+                self._totals[key] += value
+        self._last = fields
+
+    def _write_textfile(self) -> None:
+        lines = [
+            "# HELP conversor_jobs_total Jobs finalizados por status.",
+            "# TYPE conversor_jobs_total counter",
+        ]
+        for status, count in sorted(self._status_counts.items()):
+            lines.append(f'conversor_jobs_total{{status="{status}"}} {count}')
+        lines.extend(
+            [
+                "# HELP conversor_jobs_in_flight Jobs em execucao.",
+                "# TYPE conversor_jobs_in_flight gauge",
+                f"conversor_jobs_in_flight {self._in_flight}",
+            ]
+        )
+        for key, value in self._totals.items():
+            name = f"conversor_job_{key}_total"
+            lines.extend([f"# TYPE {name} counter", f"{name} {value}"])
+        speed = self._last.get("speed")
+        if isinstance(speed, (int, float)):
+            lines.extend(["# TYPE conversor_last_job_speed gauge", f"conversor_last_job_speed {speed}"])
+        rss = self._last.get("peak_rss_kb")
+        if isinstance(rss, (int, float)):
+            lines.extend(["# TYPE conversor_last_job_peak_rss_bytes gauge", f"conversor_last_job_peak_rss_bytes {rss * 1024}"])
+        tmp_file = self.textfile.with_name(self.textfile.name + ".tmp")
+        tmp_file.write_text("\n".join(lines) + "\n", encoding="utf-8")
+        os.replace(tmp_file, self.textfile)
+
+
+MAX_JOB_LOG_FILES = 2000
+MAX_JOB_LOG_BYTES = 2 * 1024 * 1024
+
+
+class JobLogFile:
+    def __init__(self, path: Path, max_bytes: int = MAX_JOB_LOG_BYTES):
+        self.path = path
+        self.max_bytes = max_bytes
+        self._written = 0
+        self._lock = threading.Lock()
+        self._fh = path.open("w", encoding="utf-8", errors="replace")
+
+    def write_line(self, line: str) -> None:
+        data = line + "\n"
+        with self._lock:
+            if self._fh is None:
+                return
+            if self._written + len(data) > self.max_bytes:
+                self._fh.close()
+                os.replace(self.path, self.path.with_name(self.path.name + ".1"))
+                self._fh = self.path.open("w", encoding="utf-8", errors="replace")
+                self._written = 0
+            self._fh.write(data)
+            self._written += len(data)
+
+    def close(self) -> None:
+        with self._lock:
+            if self._fh is not None:
+                self._fh.close()
+                self._fh = None
+
+    def __enter__(self) -> "JobLogFile":
+        return self
+
+    def __exit__(self, *_exc) -> None:
+        self.close()
+
+
+class JobLogDir:
+    def __init__(self, log_dir: Path, max_files: int = MAX_JOB_LOG_FILES, max_bytes: int = MAX_JOB_LOG_BYTES):
+        self.log_dir = log_dir
+        self.max_files = max_files
+        self.max_bytes = max_bytes
+        log_dir.mkdir(parents=True, exist_ok=True)
+        self.prune()
+
+    def open(self, name: str) -> JobLogFile:
+        return JobLogFile(self.log_dir / name, self.max_bytes)
+
+    def prune(self) -> None:
+        try:
+            with os.scandir(self.log_dir) as it:
+                entries = [(entry.stat().st_mtime_ns, entry.path) for entry in it if entry.is_file() and ".log" in entry.name]
+        except OSError:
+            return
+        entries.sort(reverse=True)
+        for _, path in entries[self.max_files:]:
+            try:
+                os.remove(path)
+            except OSError:
+                pass
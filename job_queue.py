@@ -0,0 +1,87 @@
+from pathlib import Path
+import json
+import sqlite3
+import threading
+import time
+
+
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS batches (
+    id INTEGER PRIMARY KEY AUTOINCREMENT,
+    created_at REAL NOT NULL,
+    settings TEXT NOT NULL,
+    status TEXT NOT NULL
+);
+CREATE TABLE IF NOT EXISTS jobs (
+    batch_id INTEGER NOT NULL REFERENCES batches(id),
+    position INTEGER NOT NULL,
+    source TEXT NOT NULL,
+    status TEXT NOT NULL,
+    message TEXT,
+    updated_at REAL NOT NULL,
+    PRIMARY KEY (batch_id, source)
+);
+CREATE INDEX IF NOT EXISTS jobs_status ON jobs (batch_id, status);
+"""
+
+
+class PersistentQueue:
+    def __init__(self, db_file: Path):
+        db_file.parent.mkdir(parents=True, exist_ok=True)
+        self._conn = sqlite3.connect(str(db_file), check_same_thread=False, isolation_level=None)
+        self._conn.execute("PRAGMA journal_mode=WAL")
+        self._conn.execute("PRAGMA synchronous=NORMAL")
+        self._conn.executescript(SCHEMA)
+        self._lock = threading.Lock()
+
+    def create_batch(self, settings: dict, sources: list[Path]) -> int:
+        now = time.time()
+        with self._lock:
+            self._conn.execute("BEGIN")
+            cursor = self._conn.execute(
+                "INSERT INTO batches (created_at, settings, status) VALUES (?, ?, 'running')",
+                (now, json.dumps(settings, ensure_ascii=False)),
+            )
+            batch_id = cursor.lastrowid
+            self._conn.executemany(
+                "INSERT OR IGNORE INTO jobs (batch_id, position, source, status, updated_at) VALUES (?, ?, ?, 'pending', ?)",
+                [(batch_id, position, str(source), now) for position, source in enumerate(sources)],
+            )
+            self._conn.execute("COMMIT")
+        return batch_id
+
+    def mark_finished(self, batch_id: int, source: Path, ok: bool, message: str) -> None:
+        with self._lock:
+            self._conn.execute(
+                "UPDATE jobs SET status = ?, message = ?, updated_at = ? WHERE batch_id = ? AND source = ?",
+                ("done" if ok else "failed", message[:2000], time.time(), batch_id, str(source)),
+            )
+
+    def close_batch(self, batch_id: int, status: str) -> None:
+        with self._lock:
+            self._conn.execute("UPDATE batches SET status = ? WHERE id = ?", (status, batch_id))
+
+    def interrupted_batch(self) -> tuple[int, dict, list[Path], int] | None:
+        with self._lock:
+            row = self._conn.execute(
+                "SELECT id, settings FROM batches WHERE status = 'running' ORDER BY id DESC LIMIT 1"
+            ).fetchone()
+            if row is None:
+                return None
+            batch_id, settings = row
+            pending = [
+                Path(source)
+                for (source,) in self._conn.execute(
+                    "SELECT source FROM jobs WHERE batch_id = ? AND status = 'pending' ORDER BY position",
+                    (batch_id,),
+                )
+            ]
+            (finished,) = self._conn.execute(
+                "SELECT COUNT(*) FROM jobs WHERE batch_id = ? AND status != 'pending'",
+                (batch_id,),
+            ).fetchone()
+        try:
+            parsed = json.loads(settings)
+        except ValueError:
+            parsed = {}
+        return batch_id, parsed, pending, finished
@@ -1,9 +1,27 @@
+from collections import deque
+from collections.abc import Iterator
+from concurrent.futures import ThreadPoolExecutor
 from pathlib import Path
+import csv
+import glob
+import json
+import re
 import shutil
 import subprocess
-from typing import Callable
+import sys
+import tempfile
+import threading
+import time
+import uuid
+from typing import IO, TYPE_CHECKING, Callable
 import os
 
+from job_control import JobControl, process_group_kwargs
+from media_cache import MediaCache
+
+if TYPE_CHECKING:
+    from job_metrics import JobEventLog, JobLogFile
+
 
 VIDEO_EXTENSIONS = [".mp4", ".mkv", ".avi", ".mov", ".webm", ".flv", ".wmv", ".m4v", ".vob"]
 OUTPUT_FORMATS = ["mp4", "mkv", "avi", "mov", "webm", "flv", "wmv", "m4v", "vob"]
@@ -32,14 +50,177 @@ CODEC_PRESETS = {
     "DNxHD": ["-c:v", "dnxhd"],
     "Huffyuv (lossless)": ["-c:v", "huffyuv"],
 }
+SPEED_PROFILES = {
+    "Tempo real": {
+        "libx264": ["-preset", "superfast"],
+        "libx265": ["-preset", "superfast"],
+        "libvpx-vp9": ["-deadline", "realtime", "-cpu-used", "8", "-row-mt", "1"],
+        "libaom-av1": ["-usage", "realtime", "-cpu-used", "8", "-row-mt", "1"],
+        "libvpx": ["-deadline", "realtime", "-cpu-used", "8"],
+    },
+    "Rapido": {
+        "libx264": ["-preset", "veryfast"],
+        "libx265": ["-preset", "veryfast"],
+        "libvpx-vp9": ["-deadline", "good", "-cpu-used", "5", "-row-mt", "1"],
+        "libaom-av1": ["-cpu-used", "6", "-row-mt", "1"],
+        "libvpx": ["-deadline", "good", "-cpu-used", "4"],
+    },
+    "Equilibrado": {
+        "libx264": ["-preset", "medium"],
+        "libx265": ["-preset", "medium"],
+        "libvpx-vp9": ["-deadline", "good", "-cpu-used", "2", "-row-mt", "1"],
+        "libaom-av1": ["-cpu-used", "4", "-row-mt", "1"],
+        "libvpx": ["-deadline", "good", "-cpu-used", "1"],
+    },
+    "Arquivamento": {
+        "libx264": ["-preset", "slow"],
+        "libx265": ["-preset", "slow"],
+        "libvpx-vp9": ["-deadline", "good", "-cpu-used", "0", "-row-mt", "1"],
+        "libaom-av1": ["-cpu-used", "2", "-row-mt", "1"],
+        "libvpx": ["-deadline", "best"],
+    },
+}
+DEFAULT_SPEED_PROFILE = "Equilibrado"
+AUTO_SPEED_PROFILE = "Automatico"
+CALIBRATION_SECONDS = 5.0
+QUALITY_METRICS = {"VMAF": "libvmaf", "SSIM": "ssim", "PSNR": "psnr"}
+QUALITY_TARGET_DEFAULTS = {"VMAF": 93.0, "SSIM": 0.985, "PSNR": 40.0}
+QUALITY_SCORE_PATTERNS = {
+    "VMAF": r"VMAF score[:=]\s*([0-9.]+)",
+    "SSIM": r"SSIM .*All:([0-9.]+)",
+    "PSNR": r"PSNR .*average:([0-9.]+|inf)",
+}
+QUALITY_SAMPLES = 3
+QUALITY_SAMPLE_SECONDS = 4.0
+CRF_SEARCH_GRIDS = {
+    "libx264": [16, 20, 24, 28, 32],
+    "libx265": [18, 22, 26, 30, 34],
+    "libvpx-vp9": [20, 28, 36, 44, 52],
+    "libaom-av1": [20, 28, 36, 44, 52],
+    "libvpx": [10, 20, 30, 40, 50],
+}
+PREDICT_SAMPLES = 3
+PREDICT_SAMPLE_SECONDS = 4.0
+LADDER_PRESETS = {
+    "Desativada": None,
+    "1080p + 720p + 480p": ["1080p (1920x1080)", "720p (1280x720)", "480p (854x480)"],
+    "720p + 480p": ["720p (1280x720)", "480p (854x480)"],
+    "Original + 720p": ["Original", "720p (1280x720)"],
+}
 DVD_TARGET_PRESETS = {
     "Desativado": None,
     "DVD PAL (720x576, 25fps)": "pal-dvd",
     "DVD NTSC (720x480, 29.97fps)": "ntsc-dvd",
 }
+DVD_MEDIA = {
+    "Sem limite": None,
+    "DVD-5 (4.7 GB)": 4_700_000_000,
+    "DVD-9 (8.5 GB)": 8_540_000_000,
+}
+DEFAULT_DVD_MEDIUM = "Sem limite"
+DVD_DEFAULT_VIDEO_KBPS = 6000
+DVD_VIDEO_KBPS_RANGE = (1000, 8000)
+DVD_AUDIO_KBPS = 192
+DVD_MUX_OVERHEAD = 0.04
+
+ENCODER_CODEC_NAMES = {
+    "libx264": "h264",
+    "libx265": "hevc",
+    "libvpx-vp9": "vp9",
+    "libaom-av1": "av1",
+    "mpeg2video": "mpeg2video",
+    "mpeg4": "mpeg4",
+    "libvpx": "vp8",
+    "libtheora": "theora",
+    "prores_ks": "prores",
+    "dnxhd": "dnxhd",
+    "huffyuv": "huffyuv",
+}
+AUDIO_ENCODER_CODEC_NAMES = {"aac": "aac", "libopus": "opus", "ac3": "ac3", "wmav2": "wmav2"}
+CRF_ENCODERS = {"libx264", "libx265", "libvpx-vp9", "libaom-av1", "libvpx"}
+BITRATE_ONLY_ENCODERS = {"dnxhd"}
+OUTPUT_MUXERS = {
+    "mp4": "mp4",
+    "m4v": "ipod",
+    "mkv": "matroska",
+    "avi": "avi",
+    "mov": "mov",
+    "webm": "webm",
+    "flv": "flv",
+    "wmv": "asf",
+    "vob": "vob",
+    "mpg": "mpeg",
+}
+_MP4_VIDEO = {"h264", "hevc", "av1", "vp9", "mpeg4", "mpeg2video"}
+_MP4_AUDIO = {"aac", "mp3", "ac3", "eac3", "opus", "alac", "flac"}
+CONTAINER_CODECS: dict[str, dict[str, set[str] | None]] = {
+    "mp4": {"video": _MP4_VIDEO, "audio": _MP4_AUDIO, "subtitle": {"mov_text"}},
+    "m4v": {"video": _MP4_VIDEO, "audio": _MP4_AUDIO, "subtitle": {"mov_text"}},
+    "mov": {
+        "video": {"h264", "hevc", "mpeg4", "mpeg2video", "prores", "dnxhd"},
+        "audio": {"aac", "mp3", "ac3", "alac", "pcm_s16le", "pcm_s24le"},
+        "subtitle": {"mov_text"},
+    },
+    "mkv": {
+        "video": None,
+        "audio": None,
+        "subtitle": {"subrip", "ass", "ssa", "webvtt", "hdmv_pgs_subtitle", "dvd_subtitle", "dvb_subtitle"},
+    },
+    "webm": {"video": {"vp8", "vp9", "av1"}, "audio": {"opus", "vorbis"}, "subtitle": {"webvtt"}},
+    "avi": {
+        "video": {"mpeg4", "h264", "mpeg2video", "huffyuv", "dnxhd"},
+        "audio": {"mp3", "ac3", "pcm_s16le", "aac"},
+    },
+    "flv": {"video": {"h264", "flv1"}, "audio": {"aac", "mp3"}},
+    "wmv": {"video": {"wmv1", "wmv2", "wmv3", "vc1"}, "audio": {"wmav1", "wmav2"}},
+    "vob": {"video": {"mpeg2video", "mpeg1video"}, "audio": {"ac3", "mp2", "pcm_dvd"}, "subtitle": {"dvd_subtitle"}},
+}
+CONTAINER_NONSTANDARD_CODECS: dict[str, dict[str, set[str]]] = {
+    "wmv": {"video": {"h264", "hevc", "mpeg4", "mpeg2video"}, "audio": {"aac", "mp3", "ac3"}},
+    "vob": {"video": {"h264", "mpeg4"}},
+    "flv": {"video": {"hevc", "av1", "vp9"}},
+}
+TEXT_SUBTITLE_CODECS = {"subrip", "ass", "ssa", "mov_text", "webvtt", "text"}
+SUBTITLE_ENCODERS = {"mp4": "mov_text", "m4v": "mov_text", "mov": "mov_text", "mkv": "srt", "webm": "webvtt"}
+SINGLE_AUDIO_FORMATS = {"flv"}
+STREAM_SPECIFIERS = {"audio": "a", "subtitle": "s", "attachment": "t"}
+STDERR_TAIL_LINES = 40
+TOOL_CACHE_FILE = "ferramentas.json"
+TOOL_NEGATIVE_CACHE_SECONDS = 24 * 3600
+CAPABILITIES_CACHE_FILE = "ffmpeg_capacidades.json"
+CAPABILITY_LISTINGS = {"encoders": "------", "muxers": "--", "filters": ""}
+SUMMARY_MAX_FAILURES = 20
+SUMMARY_MAX_SUCCESSES = 50
+SUMMARY_TAIL_LINES = 8
+SPLIT_MIN_DURATION = 600
+SPLIT_SEGMENT_RANGE = (30, 300)
+PROBE_WORKERS = 8
+_PROBE_FORMAT_KEYS = ("duration", "size", "bit_rate", "format_name")
+_PROBE_STREAM_KEYS = (
+    "index",
+    "codec_type",
+    "codec_name",
+    "profile",
+    "width",
+    "height",
+    "pix_fmt",
+    "field_order",
+    "avg_frame_rate",
+    "r_frame_rate",
+    "bit_rate",
+    "sample_rate",
+    "channels",
+    "channel_layout",
+    "duration",
+    "disposition",
+    "tags",
+)
 
 ProgressCallback = Callable[[str, float | None, int | None, int | None], None]
 CancelCheck = Callable[[], bool]
+Rendition = tuple[str, str, str, str]
+JobCallback = Callable[[Path, bool, str], None]
+EventCallback = Callable[[str, dict], None]
 
 
 def check_ffmpeg() -> bool:
@@ -69,7 +250,8 @@ def _windows_to_wsl_path(path: Path) -> str:
     if not drive:
         return path_str.replace("\\", "/")
     drive_letter = drive[0].lower()
-    return f"/mnt/{drive_letter}{tail.replace('\\', '/')}"
+    posix_tail = tail.replace("\\", "/")
+    return f"/mnt/{drive_letter}{posix_tail}"
 
 
 def _build_dvdauthor_cmd(base_cmd: list[str], use_wsl: bool) -> list[str]:
@@ -84,6 +266,41 @@ def build_output_path(source_file: Path, output_dir: Path | None, output_format:
     return target_dir / f"{source_file.stem}_convertido.{output_format}"
 
 
+def is_converted_output(path: Path) -> bool:
+    return path.stem.endswith("_convertido") or "_convertido_" in path.stem
+
+
+def partial_output_path(target_file: Path) -> Path:
+    return target_file.with_name(f".{target_file.stem}.parcial{target_file.suffix}")
+
+
+def remove_stale_partials(source_file: Path, output_dir: Path | None) -> int:
+    target_dir = output_dir if output_dir else source_file.parent
+    removed = 0
+    for partial in target_dir.glob(f".{glob.escape(source_file.stem)}_convertido*.parcial.*"):
+        try:
+            partial.unlink()
+        except OSError:
+            continue
+        removed += 1
+    return removed
+
+
+def commit_outputs(pairs: list[tuple[Path, Path]], ok: bool) -> str | None:
+    if not ok:
+        for partial, _ in pairs:
+            partial.unlink(missing_ok=True)
+        return None
+    for position, (partial, target) in enumerate(pairs):
+        try:
+            os.replace(partial, target)
+        except OSError as exc:
+            for leftover, _ in pairs[position:]:
+                leftover.unlink(missing_ok=True)
+            return f"Falha ao mover a saida para o destino: {exc}"
+    return None
+
+
 def build_scale_filter(preset: tuple[int, int] | None) -> str | None:
     if preset is None:
         return None
@@ -94,6 +311,530 @@ def build_scale_filter(preset: tuple[int, int] | None) -> str | None:
     )
 
 
+def user_config_dir() -> Path:
+    if os.name == "nt":
+        base = os.environ.get("APPDATA") or str(Path.home() / "AppData" / "Roaming")
+    else:
+        base = os.environ.get("XDG_CONFIG_HOME") or str(Path.home() / ".config")
+    return Path(base) / "conversor-de-video"
+
+
+_tool_cache_lock = threading.Lock()
+
+
+def _binary_stamp(name: str) -> list | None:
+    path = shutil.which(name)
+    if not path:
+        return None
+    try:
+        return [path, os.stat(path).st_mtime_ns]
+    except OSError:
+        return None
+
+
+def cached_tool_check(name: str, check: Callable[[], bool], binaries: list[str]) -> bool:
+    cache_file = user_config_dir() / TOOL_CACHE_FILE
+    key = {"path": os.environ.get("PATH", ""), "binaries": {binary: _binary_stamp(binary) for binary in binaries}}
+    with _tool_cache_lock:
+        try:
+            entry = json.loads(cache_file.read_text(encoding="utf-8")).get(name)
+        except (OSError, ValueError, AttributeError):
+            entry = None
+    if isinstance(entry, dict) and entry.get("key") == key:
+        if entry.get("ok") or time.time() - entry.get("checked_at", 0) < TOOL_NEGATIVE_CACHE_SECONDS:
+            return bool(entry.get("ok"))
+    ok = check()
+    with _tool_cache_lock:
+        try:
+            data = json.loads(cache_file.read_text(encoding="utf-8"))
+        except (OSError, ValueError):
+            data = {}
+        if not isinstance(data, dict):
+            data = {}
+        data[name] = {"key": key, "ok": ok, "checked_at": time.time()}
+        try:
+            cache_file.parent.mkdir(parents=True, exist_ok=True)
+            tmp_file = cache_file.with_name(cache_file.name + ".tmp")
+            tmp_file.write_text(json.dumps(data, ensure_ascii=False), encoding="utf-8")
+            os.replace(tmp_file, cache_file)
+        except OSError:
+            pass
+    return ok
+
+
+def check_dvdauthor_cached() -> bool:
+    if check_tool("dvdauthor"):
+        return True
+    if not check_tool("wsl"):
+        return False
+    return cached_tool_check("dvdauthor_wsl", check_dvdauthor, ["wsl"])
+
+
+_media_cache: MediaCache | None = None
+_ffmpeg_capabilities: tuple[list | None, dict[str, set[str]]] | None = None
+
+
+def get_media_cache() -> MediaCache:
+    global _media_cache
+    if _media_cache is None:
+        _media_cache = MediaCache(user_config_dir() / "media_cache.json")
+    return _media_cache
+
+
+def _compact_probe(raw: dict) -> dict:
+    fmt = raw.get("format", {})
+    streams = []
+    for stream in raw.get("streams", []):
+        compact = {key: stream[key] for key in _PROBE_STREAM_KEYS if key in stream}
+        if "tags" in compact:
+            compact["tags"] = {k: v for k, v in compact["tags"].items() if k.lower() in ("language", "title")}
+        streams.append(compact)
+    return {
+        "format": {key: fmt[key] for key in _PROBE_FORMAT_KEYS if key in fmt},
+        "streams": streams,
+    }
+
+
+def probe_media(source_file: Path) -> dict | None:
+    if not check_tool("ffprobe"):
+        return None
+    probe = subprocess.run(
+        [
+            "ffprobe",
+            "-v",
+            "error",
+            "-print_format",
+            "json",
+            "-show_format",
+            "-show_streams",
+            str(source_file),
+        ],
+        capture_output=True,
+        text=True,
+    )
+    if probe.returncode != 0:
+        return None
+    try:
+        return _compact_probe(json.loads(probe.stdout or "{}"))
+    except json.JSONDecodeError:
+        return None
+
+
+def probe_media_many(paths: list[Path], save: bool = True) -> dict[Path, dict | None]:
+    cache = get_media_cache()
+    found = cache.get_many(paths)
+    missing = [path for path, info in found.items() if info is None and path.exists()]
+    if missing:
+        with ThreadPoolExecutor(max_workers=min(PROBE_WORKERS, len(missing))) as pool:
+            for path, info in zip(missing, pool.map(probe_media, missing)):
+                found[path] = info
+                if info is not None:
+                    cache.put(path, info)
+        if save:
+            cache.save()
+    return found
+
+
+def media_duration(info: dict | None) -> float | None:
+    if not info:
+        return None
+    try:
+        duration = float(info.get("format", {}).get("duration", 0))
+    except (TypeError, ValueError):
+        return None
+    return duration if duration > 0 else None
+
+
+def media_streams(info: dict | None, codec_type: str) -> list[dict]:
+    if not info:
+        return []
+    return [st for st in info.get("streams", []) if st.get("codec_type") == codec_type]
+
+
+def container_accepts(output_format: str, codec_type: str, codec_name: str) -> bool:
+    allowed = CONTAINER_CODECS.get(output_format, {}).get(codec_type, set())
+    return allowed is None or codec_name in allowed
+
+
+def primary_video_stream(info: dict | None) -> dict | None:
+    for stream in media_streams(info, "video"):
+        if not stream.get("disposition", {}).get("attached_pic"):
+            return stream
+    return None
+
+
+def container_tolerates(output_format: str, codec_type: str, codec_name: str) -> bool:
+    return codec_name in CONTAINER_NONSTANDARD_CODECS.get(output_format, {}).get(codec_type, set())
+
+
+def can_stream_copy(
+    info: dict | None,
+    codec_args: list[str],
+    resolution: tuple[int, int] | None,
+    output_format: str,
+) -> bool:
+    video = primary_video_stream(info)
+    if video is None:
+        return False
+    encoder = codec_args[1] if len(codec_args) > 1 else ""
+    if video.get("codec_name") != ENCODER_CODEC_NAMES.get(encoder):
+        return False
+    if resolution is not None and (video.get("width"), video.get("height")) != resolution:
+        return False
+    return container_accepts(output_format, "video", video.get("codec_name", ""))
+
+
+def plan_streams(info: dict | None, output_format: str) -> list[dict]:
+    plan: list[dict] = []
+    audio_encoder = build_audio_args(output_format)[1]
+    for stream in media_streams(info, "audio"):
+        codec = stream.get("codec_name", "")
+        if output_format in SINGLE_AUDIO_FORMATS and any(entry["type"] == "audio" and entry["action"] != "drop" for entry in plan):
+            plan.append({"type": "audio", "index": stream.get("index"), "codec": codec, "action": "drop"})
+        elif container_accepts(output_format, "audio", codec):
+            plan.append({"type": "audio", "index": stream.get("index"), "codec": codec, "action": "copy"})
+        else:
+            plan.append({"type": "audio", "index": stream.get("index"), "codec": codec, "action": audio_encoder})
+    for stream in media_streams(info, "subtitle"):
+        codec = stream.get("codec_name", "")
+        if container_accepts(output_format, "subtitle", codec):
+            action = "copy"
+        elif codec in TEXT_SUBTITLE_CODECS and output_format in SUBTITLE_ENCODERS:
+            action = SUBTITLE_ENCODERS[output_format]
+        else:
+            action = "drop"
+        plan.append({"type": "subtitle", "index": stream.get("index"), "codec": codec, "action": action})
+    if output_format == "mkv":
+        for stream in media_streams(info, "attachment"):
+            plan.append({"type": "attachment", "index": stream.get("index"), "codec": stream.get("codec_name", ""), "action": "copy"})
+    return plan
+
+
+def build_stream_args(
+    info: dict | None,
+    output_format: str,
+    input_index: int = 0,
+    video_map: str | None = None,
+) -> list[str]:
+    video = primary_video_stream(info)
+    if video is None or "index" not in video:
+        maps = ["-map", video_map, "-map", f"{input_index}:a:0?"] if video_map else []
+        return [*maps, *build_audio_args(output_format)]
+    args = ["-map", video_map or f"{input_index}:{video['index']}"]
+    counters: dict[str, int] = {}
+    for entry in plan_streams(info, output_format):
+        if entry["action"] == "drop" or entry["index"] is None:
+            continue
+        kind = STREAM_SPECIFIERS[entry["type"]]
+        number = counters.get(kind, 0)
+        counters[kind] = number + 1
+        args.extend(["-map", f"{input_index}:{entry['index']}", f"-c:{kind}:{number}", entry["action"]])
+        if entry["type"] == "audio" and entry["action"] != "copy":
+            args.extend([f"-b:a:{number}", build_audio_args(output_format)[3]])
+    return args
+
+
+def stream_plan_summary(plan: list[dict]) -> dict[str, int]:
+    summary = {"copy": 0, "transcode": 0, "drop": 0}
+    for entry in plan:
+        summary[entry["action"] if entry["action"] in ("copy", "drop") else "transcode"] += 1
+    return summary
+
+
+def iter_ffmpeg_progress(stream: IO[str]) -> Iterator[dict[str, str]]:
+    snapshot: dict[str, str] = {}
+    for line in stream:
+        key, sep, value = line.strip().partition("=")
+        if not sep:
+            continue
+        snapshot[key] = value.strip()
+        if key == "progress":
+            yield dict(snapshot)
+            snapshot.clear()
+
+
+def _progress_seconds(snapshot: dict[str, str]) -> float | None:
+    for key in ("out_time_us", "out_time_ms"):
+        try:
+            return max(0.0, int(snapshot[key]) / 1_000_000)
+        except (KeyError, ValueError):
+            continue
+    return None
+
+
+def format_timestamp(seconds: float) -> str:
+    sec = max(0, int(seconds))
+    return f"{sec // 3600:02d}:{(sec % 3600) // 60:02d}:{sec % 60:02d}"
+
+
+def format_progress(snapshot: dict[str, str], duration: float | None) -> tuple[str, float | None]:
+    position = _progress_seconds(snapshot)
+    fraction = None
+    parts = []
+    if position is not None:
+        if duration:
+            fraction = min(1.0, position / duration)
+            parts.append(f"{format_timestamp(position)} / {format_timestamp(duration)}")
+        else:
+            parts.append(format_timestamp(position))
+    fps = snapshot.get("fps", "")
+    if fps and fps != "0.00":
+        parts.append(f"{fps} fps")
+    speed = snapshot.get("speed", "")
+    if speed and speed != "N/A":
+        parts.append(speed.strip())
+    bitrate = snapshot.get("bitrate", "")
+    if bitrate and bitrate != "N/A":
+        parts.append(bitrate)
+    if snapshot.get("progress") == "end":
+        fraction = 1.0
+    return " | ".join(parts), fraction
+
+
+def _drain_to_tail(stream: IO[str], tail: deque[str], log_file: "JobLogFile | None" = None) -> None:
+    for line in stream:
+        line = line.rstrip()
+        if line:
+            tail.append(line)
+            if log_file:
+                log_file.write_line(line)
+
+
+def _watch_cancel(
+    process: subprocess.Popen,
+    cancel_check: CancelCheck,
+    canceled: threading.Event,
+    finished: threading.Event,
+) -> None:
+    while not finished.wait(0.4):
+        if cancel_check():
+            canceled.set()
+            process.terminate()
+            if not finished.wait(3):
+                process.kill()
+            return
+
+
+def _reap_process(process: subprocess.Popen, started: float, stats: dict | None) -> None:
+    usage = None
+    if hasattr(os, "wait4"):
+        try:
+            _, status, usage = os.wait4(process.pid, 0)
+            process.returncode = os.waitstatus_to_exitcode(status)
+        except ChildProcessError:
+            process.wait()
+    else:
+        process.wait()
+    if stats is None:
+        return
+    stats["wall_seconds"] = time.monotonic() - started
+    stats["cpu_seconds"] = usage.ru_utime + usage.ru_stime if usage else None
+    if usage:
+        stats["peak_rss_kb"] = usage.ru_maxrss // 1024 if sys.platform == "darwin" else usage.ru_maxrss
+    else:
+        stats["peak_rss_kb"] = None
+
+
+def _accumulate_stats(total: dict | None, part: dict) -> None:
+    if total is None:
+        return
+    if part.get("cpu_seconds") is not None:
+        total["cpu_seconds"] = (total.get("cpu_seconds") or 0.0) + part["cpu_seconds"]
+    if part.get("peak_rss_kb") is not None:
+        total["peak_rss_kb"] = max(total.get("peak_rss_kb") or 0, part["peak_rss_kb"])
+    if "exit_code" in part and total.get("exit_code") in (None, 0):
+        total["exit_code"] = part["exit_code"]
+
+
+def execute_ffmpeg(
+    cmd: list[str],
+    cancel_check: CancelCheck | None = None,
+    progress_callback: ProgressCallback | None = None,
+    duration: float | None = None,
+    stats: dict | None = None,
+    event_callback: EventCallback | None = None,
+    log_file: "JobLogFile | None" = None,
+) -> tuple[int, str, bool]:
+    if log_file:
+        log_file.write_line("$ " + subprocess.list2cmdline(cmd))
+    started = time.monotonic()
+    control = cancel_check if isinstance(cancel_check, JobControl) else None
+    process = subprocess.Popen(
+        cmd,
+        stdout=subprocess.PIPE,
+        stderr=subprocess.PIPE,
+        text=True,
+        encoding="utf-8",
+        errors="replace",
+        **(process_group_kwargs() if control else {}),
+    )
+    if event_callback:
+        event_callback("spawned", {"pid": process.pid})
+    stderr_tail: deque[str] = deque(maxlen=STDERR_TAIL_LINES)
+    stderr_reader = threading.Thread(target=_drain_to_tail, args=(process.stderr, stderr_tail, log_file), daemon=True)
+    stderr_reader.start()
+    canceled = threading.Event()
+    finished = threading.Event()
+    if control:
+        control.attach(process)
+    elif cancel_check:
+        threading.Thread(
+            target=_watch_cancel,
+            args=(process, cancel_check, canceled, finished),
+            daemon=True,
+        ).start()
+
+    try:
+        first_progress = True
+        for snapshot in iter_ffmpeg_progress(process.stdout):
+            if first_progress and event_callback:
+                event_callback("first_progress", {"seconds_after_spawn": round(time.monotonic() - started, 3)})
+            first_progress = False
+            if progress_callback and not (canceled.is_set() or (control and control.canceled)):
+                message, fraction = format_progress(snapshot, duration)
+                progress_callback(message, fraction, None, None)
+        _reap_process(process, started, stats)
+        if stats is not None:
+            stats["exit_code"] = process.returncode
+    finally:
+        finished.set()
+        if control:
+            control.detach(process)
+            if control.canceled and process.returncode != 0:
+                canceled.set()
+    stderr_reader.join(timeout=1)
+    if log_file:
+        log_file.write_line(f"# codigo de saida: {process.returncode}")
+    return process.returncode, "\n".join(stderr_tail).strip(), canceled.is_set()
+
+
+def execute_ffmpeg_two_pass(
+    cmd: list[str],
+    output: str,
+    cancel_check: CancelCheck | None = None,
+    progress_callback: ProgressCallback | None = None,
+    duration: float | None = None,
+    stats: dict | None = None,
+    event_callback: EventCallback | None = None,
+    log_file: "JobLogFile | None" = None,
+) -> tuple[int, str, bool]:
+    with tempfile.TemporaryDirectory(prefix="passlog_") as passlog_dir:
+        passlog = str(Path(passlog_dir) / "passagem")
+        result = (0, "", False)
+        for number, output_args in ((1, ["-an", os.devnull]), (2, [output])):
+
+            def on_pass_progress(message: str, fraction: float | None, done: int | None, total: int | None) -> None:
+                if progress_callback:
+                    overall = None if fraction is None else (number - 1 + fraction) / 2
+                    progress_callback(f"Passagem {number}/2 | {message}", overall, done, total)
+
+            pass_stats: dict = {}
+            result = execute_ffmpeg(
+                [*cmd, "-pass", str(number), "-passlogfile", passlog, *output_args],
+                cancel_check,
+                on_pass_progress,
+                duration,
+                pass_stats,
+                event_callback,
+                log_file,
+            )
+            _accumulate_stats(stats, pass_stats)
+            if result[0] != 0 or result[2]:
+                break
+        return result
+
+
+def plan_dvd_bitrate(durations: list[float | None], dvd_medium: str) -> tuple[int | None, str]:
+    capacity = DVD_MEDIA.get(dvd_medium)
+    if not capacity or not durations:
+        return None, ""
+    unknown = sum(1 for duration in durations if not duration)
+    if unknown:
+        return None, f"{unknown} titulo(s) sem duracao conhecida; nao e possivel planejar o {dvd_medium}."
+    total_seconds = sum(durations)
+    usable_bits = capacity * (1 - DVD_MUX_OVERHEAD) * 8
+    video_kbps = min(int(usable_bits / total_seconds / 1000) - DVD_AUDIO_KBPS, DVD_VIDEO_KBPS_RANGE[1])
+    if video_kbps < DVD_VIDEO_KBPS_RANGE[0]:
+        max_seconds = usable_bits / ((DVD_VIDEO_KBPS_RANGE[0] + DVD_AUDIO_KBPS) * 1000)
+        return None, (
+            f"Os titulos somam {format_timestamp(total_seconds)} e nao cabem em um {dvd_medium} "
+            f"(maximo de {format_timestamp(max_seconds)} com video a {DVD_VIDEO_KBPS_RANGE[0]} kbps)."
+        )
+    estimated_bytes = total_seconds * (video_kbps + DVD_AUDIO_KBPS) * 1000 / 8 / (1 - DVD_MUX_OVERHEAD)
+    return video_kbps, (
+        f"Plano de disco {dvd_medium}: {format_timestamp(total_seconds)} de video a {video_kbps} kbps por titulo "
+        f"(~{estimated_bytes / 1e9:.2f} GB de {capacity / 1e9:.2f} GB)."
+    )
+
+
+def resolve_worker_count(max_workers: int | None, total: int) -> int:
+    cores = os.cpu_count() or 1
+    requested = max_workers if max_workers and max_workers > 0 else 1
+    return max(1, min(requested, total, cores))
+
+
+def threads_per_job(workers: int) -> int:
+    return max(1, (os.cpu_count() or 1) // max(1, workers))
+
+
+def build_thread_args(codec_args: list[str], threads: int | None) -> list[str]:
+    if not threads:
+        return []
+    encoder = codec_args[1] if len(codec_args) > 1 else ""
+    args = ["-threads", str(threads), "-filter_threads", str(threads)]
+    if encoder == "libx265":
+        args.extend(["-x265-params", f"pools={threads}"])
+    return args
+
+
+def build_audio_args(output_format: str) -> list[str]:
+    if output_format == "webm":
+        return ["-c:a", "libopus", "-b:a", "128k"]
+    if output_format == "wmv":
+        return ["-c:a", "wmav2", "-b:a", "192k"]
+    if output_format == "vob":
+        return ["-c:a", "ac3", "-b:a", "192k"]
+    return ["-c:a", "aac", "-b:a", "192k"]
+
+
+def build_dvd_args(dvd_target: str, threads: int | None = None, video_kbps: int | None = None) -> list[str]:
+    if dvd_target == "pal-dvd":
+        dvd_w, dvd_h, dvd_fps = 720, 576, "25"
+    else:
+        dvd_w, dvd_h, dvd_fps = 720, 480, "29.97"
+    dvd_vf = (
+        f"scale=w={dvd_w}:h={dvd_h}:force_original_aspect_ratio=decrease,"
+        f"pad={dvd_w}:{dvd_h}:(ow-iw)/2:(oh-ih)/2"
+    )
+    return [
+        "-target",
+        dvd_target,
+        "-r",
+        dvd_fps,
+        "-vf",
+        dvd_vf,
+        "-c:v",
+        "mpeg2video",
+        "-b:v",
+        f"{video_kbps or DVD_DEFAULT_VIDEO_KBPS}k",
+        "-maxrate",
+        "9000k",
+        "-bufsize",
+        "1835k",
+        "-c:a",
+        "ac3",
+        "-b:a",
+        f"{DVD_AUDIO_KBPS}k",
+        *build_thread_args(["-c:v", "mpeg2video"], threads),
+    ]
+
+
+def build_speed_args(codec_args: list[str], speed_profile: str) -> list[str]:
+    encoder = codec_args[1] if len(codec_args) > 1 else ""
+    profile = SPEED_PROFILES.get(speed_profile, SPEED_PROFILES[DEFAULT_SPEED_PROFILE])
+    return list(profile.get(encoder, []))
+
+
 def run_ffmpeg(
     source_file: Path,
     target_file: Path,
@@ -102,66 +843,932 @@ def run_ffmpeg(
     scale_filter: str | None,
     dvd_target: str | None,
     cancel_check: CancelCheck | None = None,
+    threads: int | None = None,
+    progress_callback: ProgressCallback | None = None,
+    duration: float | None = None,
+    stream_copy: bool = False,
+    stats: dict | None = None,
+    event_callback: EventCallback | None = None,
+    speed_profile: str = DEFAULT_SPEED_PROFILE,
+    sample_window: tuple[float, float] | None = None,
+    log_file: "JobLogFile | None" = None,
+    media_info: dict | None = None,
+    dvd_video_kbps: int | None = None,
+    two_pass: bool = False,
 ) -> tuple[bool, str, bool]:
-    cmd = ["ffmpeg", "-y", "-i", str(source_file)]
+    output_format = target_file.suffix.lstrip(".").lower()
+    cmd = ["ffmpeg", "-y", "-nostats", "-progress", "pipe:1"]
+    if sample_window:
+        cmd.extend(["-ss", f"{sample_window[0]:.3f}", "-t", f"{sample_window[1]:.3f}"])
+    cmd.extend(["-i", str(source_file)])
     if dvd_target:
-        if dvd_target == "pal-dvd":
-            dvd_w, dvd_h, dvd_fps = 720, 576, "25"
-        else:
-            dvd_w, dvd_h, dvd_fps = 720, 480, "29.97"
-        dvd_vf = (
-            f"scale=w={dvd_w}:h={dvd_h}:force_original_aspect_ratio=decrease,"
-            f"pad={dvd_w}:{dvd_h}:(ow-iw)/2:(oh-ih)/2"
+        cmd.extend(build_dvd_args(dvd_target, threads, dvd_video_kbps))
+    elif stream_copy:
+        cmd.extend(["-c:v", "copy", *build_stream_args(media_info, output_format)])
+    else:
+        cmd.extend([*codec_args, "-crf", crf, *build_speed_args(codec_args, speed_profile)])
+        cmd.extend(build_thread_args(codec_args, threads))
+        if scale_filter:
+            cmd.extend(["-vf", scale_filter])
+        cmd.extend(build_stream_args(media_info, output_format))
+    partial_file = partial_output_path(target_file)
+    if dvd_target and two_pass:
+        returncode, stderr_tail, canceled = execute_ffmpeg_two_pass(
+            cmd,
+            str(partial_file),
+            cancel_check,
+            progress_callback,
+            duration,
+            stats,
+            event_callback,
+            log_file,
+        )
+    else:
+        returncode, stderr_tail, canceled = execute_ffmpeg(
+            [*cmd, str(partial_file)],
+            cancel_check,
+            progress_callback,
+            duration,
+            stats,
+            event_callback,
+            log_file,
         )
+    commit_error = commit_outputs([(partial_file, target_file)], returncode == 0 and not canceled)
+    if canceled:
+        return False, f"CANCELADO: {source_file.name}", True
+    if commit_error:
+        return False, f"FALHA: {source_file.name}\n{commit_error}", False
+    if returncode == 0:
+        if stream_copy:
+            return True, f"OK (copia de streams): {target_file}", False
+        return True, f"OK: {target_file}", False
+    error_msg = stderr_tail or "Erro desconhecido no FFmpeg."
+    return False, f"FALHA: {source_file.name}\n{error_msg}", False
+
+
+def source_frame_rate(info: dict | None) -> float:
+    for stream in media_streams(info, "video"):
+        num, _, den = (stream.get("avg_frame_rate") or stream.get("r_frame_rate") or "").partition("/")
+        try:
+            rate = float(num) / float(den or 1)
+        except (ValueError, ZeroDivisionError):
+            continue
+        if rate > 0:
+            return rate
+    return 30.0
+
+
+def calibrate_speed_profile(
+    source_file: Path,
+    duration: float | None,
+    codec_args: list[str],
+    crf: str,
+    scale_filter: str | None,
+    required_speed: float,
+    threads: int | None = None,
+    cancel_check: CancelCheck | None = None,
+    progress_callback: ProgressCallback | None = None,
+) -> str:
+    profiles = list(SPEED_PROFILES)
+    if len({tuple(build_speed_args(codec_args, name)) for name in profiles}) == 1:
+        return DEFAULT_SPEED_PROFILE
+    length = min(CALIBRATION_SECONDS, duration or CALIBRATION_SECONDS)
+    start = max(0.0, (duration or 0) / 2 - length / 2)
+    chosen = profiles[0]
+    with tempfile.TemporaryDirectory(prefix="calibracao_") as tmp_dir:
+        for name in profiles:
+            if cancel_check and cancel_check():
+                break
+            if progress_callback:
+                progress_callback(f"Calibrando perfil de velocidade: {name}...", None, None, None)
+            stats: dict = {}
+            ok, _, canceled = run_ffmpeg(
+                source_file=source_file,
+                target_file=Path(tmp_dir) / "calibracao.mkv",
+                crf=crf,
+                codec_args=codec_args,
+                scale_filter=scale_filter,
+                dvd_target=None,
+                cancel_check=cancel_check,
+                threads=threads,
+                stats=stats,
+                speed_profile=name,
+                sample_window=(start, length),
+            )
+            if not ok or canceled:
+                break
+            speed = length / max(stats.get("wall_seconds") or 0.0, 1e-6)
+            if speed < required_speed:
+                break
+            chosen = name
+    return chosen
+
+
+def estimate_job_cost(
+    source_file: Path,
+    info: dict | None,
+    resolution: tuple[int, int] | None,
+    stream_copy: bool = False,
+) -> float:
+    duration = media_duration(info)
+    if duration is None:
+        try:
+            return source_file.stat().st_size / 1_000_000
+        except OSError:
+            return 0.0
+    if stream_copy:
+        return duration * 0.01
+    videos = media_streams(info, "video")
+    src_w = videos[0].get("width") or 1920 if videos else 1920
+    src_h = videos[0].get("height") or 1080 if videos else 1080
+    out_w, out_h = resolution if resolution else (src_w, src_h)
+    pixels = (src_w * src_h * 0.25 + out_w * out_h) / (1920 * 1080)
+    return duration * pixels * source_frame_rate(info) / 30
+
+
+def build_ladder_renditions(
+    ladder_name: str,
+    output_format: str,
+    codec_name: str,
+    quality_name: str,
+) -> list[Rendition] | None:
+    resolutions = LADDER_PRESETS.get(ladder_name)
+    if not resolutions:
+        return None
+    return [(output_format, codec_name, quality_name, resolution_name) for resolution_name in resolutions]
+
+
+def build_rendition_paths(source_file: Path, output_dir: Path | None, renditions: list[Rendition]) -> list[Path]:
+    target_dir = output_dir if output_dir else source_file.parent
+    labels = []
+    for output_format, codec_name, _quality, resolution_name in renditions:
+        preset = RESOLUTION_PRESETS[resolution_name]
+        labels.append((output_format, f"{preset[1]}p" if preset else "original", codec_name))
+    paths = []
+    for output_format, label, codec_name in labels:
+        if sum(1 for fmt, lbl, _ in labels if (fmt, lbl) == (output_format, label)) > 1:
+            encoder = CODEC_PRESETS[codec_name][1]
+            label = f"{label}_{encoder}"
+        paths.append(target_dir / f"{source_file.stem}_convertido_{label}.{output_format}")
+    return paths
+
+
+def build_ladder_cmd(
+    source_file: Path,
+    renditions: list[Rendition],
+    target_files: list[Path],
+    threads: int | None = None,
+    speed_profile: str = DEFAULT_SPEED_PROFILE,
+    media_info: dict | None = None,
+) -> list[str]:
+    groups: dict[str, list[int]] = {}
+    for index, (_fmt, _codec, _quality, resolution_name) in enumerate(renditions):
+        groups.setdefault(build_scale_filter(RESOLUTION_PRESETS[resolution_name]) or "null", []).append(index)
+    split_labels = "".join(f"[s{k}]" for k in range(len(groups)))
+    graph = [f"[0:v:0]split={len(groups)}{split_labels}" if len(groups) > 1 else "[0:v:0]null[s0]"]
+    for k, (scale_filter, indexes) in enumerate(groups.items()):
+        outputs = "".join(f"[o{i}]" for i in indexes)
+        if len(indexes) > 1:
+            graph.append(f"[s{k}]{scale_filter},split={len(indexes)}{outputs}")
+        else:
+            graph.append(f"[s{k}]{scale_filter}{outputs}")
+    cmd = [
+        "ffmpeg",
+        "-y",
+        "-nostats",
+        "-progress",
+        "pipe:1",
+        "-i",
+        str(source_file),
+        "-filter_complex",
+        ";".join(graph),
+    ]
+    for index, (output_format, codec_name, quality_name, _resolution) in enumerate(renditions):
+        codec_args = CODEC_PRESETS[codec_name]
         cmd.extend(
             [
-                "-target",
-                dvd_target,
-                "-r",
-                dvd_fps,
-                "-vf",
-                dvd_vf,
-                "-c:v",
-                "mpeg2video",
-                "-b:v",
-                "6000k",
-                "-maxrate",
-                "9000k",
-                "-bufsize",
-                "1835k",
-                "-c:a",
-                "ac3",
-                "-b:a",
-                "192k",
+                *build_stream_args(media_info, output_format, video_map=f"[o{index}]"),
+                *codec_args,
+                "-crf",
+                QUALITY_PRESETS[quality_name],
+                *build_speed_args(codec_args, speed_profile),
+                *build_thread_args(codec_args, threads),
+                str(target_files[index]),
             ]
         )
-    else:
-        cmd.extend([*codec_args, "-crf", crf, "-preset", "medium"])
-        if scale_filter:
-            cmd.extend(["-vf", scale_filter])
-        cmd.extend(["-c:a", "aac", "-b:a", "192k"])
-    cmd.append(str(target_file))
+    return cmd
 
-    process = subprocess.Popen(cmd, stdout=subprocess.PIPE, stderr=subprocess.PIPE, text=True)
-    while True:
-        if cancel_check and cancel_check():
-            process.terminate()
-            try:
-                stdout, stderr = process.communicate(timeout=3)
-            except subprocess.TimeoutExpired:
-                process.kill()
-                stdout, stderr = process.communicate()
+
+def run_rendition_ladder(
+    source_file: Path,
+    renditions: list[Rendition],
+    output_dir: Path | None,
+    cancel_check: CancelCheck | None = None,
+    threads: int | None = None,
+    progress_callback: ProgressCallback | None = None,
+    duration: float | None = None,
+    stats: dict | None = None,
+    event_callback: EventCallback | None = None,
+    speed_profile: str = DEFAULT_SPEED_PROFILE,
+    log_file: "JobLogFile | None" = None,
+    media_info: dict | None = None,
+) -> tuple[bool, str, bool]:
+    target_files = build_rendition_paths(source_file, output_dir, renditions)
+    partial_files = [partial_output_path(path) for path in target_files]
+    cmd = build_ladder_cmd(source_file, renditions, partial_files, threads, speed_profile, media_info)
+    returncode, error_msg, canceled = execute_ffmpeg(
+        cmd,
+        cancel_check,
+        progress_callback,
+        duration,
+        stats,
+        event_callback,
+        log_file,
+    )
+    commit_error = commit_outputs(list(zip(partial_files, target_files)), returncode == 0 and not canceled)
+    if canceled:
+        return False, f"CANCELADO: {source_file.name}", True
+    if commit_error:
+        return False, f"FALHA: {source_file.name}\n{commit_error}", False
+    if returncode != 0:
+        return False, f"FALHA: {source_file.name}\n{error_msg or 'Erro desconhecido no FFmpeg.'}", False
+    return True, "OK: " + "\n".join(str(path) for path in target_files), False
+
+
+def split_segment_seconds(duration: float, workers: int) -> int:
+    low, high = SPLIT_SEGMENT_RANGE
+    return int(min(high, max(low, duration / (workers * 3))))
+
+
+def run_ffmpeg_split(
+    source_file: Path,
+    target_file: Path,
+    crf: str,
+    codec_args: list[str],
+    scale_filter: str | None,
+    workers: int,
+    duration: float,
+    cancel_check: CancelCheck | None = None,
+    threads: int | None = None,
+    progress_callback: ProgressCallback | None = None,
+    stats: dict | None = None,
+    event_callback: EventCallback | None = None,
+    speed_profile: str = DEFAULT_SPEED_PROFILE,
+    log_file: "JobLogFile | None" = None,
+    media_info: dict | None = None,
+) -> tuple[bool, str, bool]:
+    work_dir = Path(tempfile.mkdtemp(prefix=f".{source_file.stem}_segmentos_", dir=target_file.parent))
+    try:
+        if progress_callback:
+            progress_callback("Dividindo em segmentos nos keyframes...", None, None, None)
+        segment_list = work_dir / "segmentos.csv"
+        split_stats: dict = {}
+        returncode, error_msg, canceled = execute_ffmpeg(
+            [
+                "ffmpeg",
+                "-y",
+                "-nostats",
+                "-progress",
+                "pipe:1",
+                "-i",
+                str(source_file),
+                "-map",
+                "0:v:0",
+                "-c",
+                "copy",
+                "-f",
+                "segment",
+                "-segment_time",
+                str(split_segment_seconds(duration, workers)),
+                "-reset_timestamps",
+                "1",
+                "-segment_list",
+                str(segment_list),
+                "-segment_list_type",
+                "csv",
+                str(work_dir / "src_%05d.mkv"),
+            ],
+            cancel_check,
+            stats=split_stats,
+            event_callback=event_callback,
+            log_file=log_file,
+        )
+        _accumulate_stats(stats, split_stats)
+        if canceled:
             return False, f"CANCELADO: {source_file.name}", True
+        if returncode != 0 or not segment_list.exists():
+            return False, f"FALHA: {source_file.name}\n{error_msg or 'Falha ao dividir o video.'}", False
+
+        with segment_list.open(newline="", encoding="utf-8") as fh:
+            rows = [row for row in csv.reader(fh) if len(row) >= 3]
+        segments = [(work_dir / row[0], max(0.001, float(row[2]) - float(row[1]))) for row in rows]
+        weights = {index: seg_duration for index, (_, seg_duration) in enumerate(segments)}
+        total_weight = sum(weights.values()) or 1.0
+        fractions: dict[int, float] = {}
+        progress_lock = threading.Lock()
+        segment_stats: list[dict] = [{} for _ in segments]
+
+        def encode_segment(index: int) -> tuple[bool, str, bool]:
+            segment_file, seg_duration = segments[index]
+
+            def on_segment_progress(_message: str, fraction: float | None, _done: int | None, _total: int | None) -> None:
+                if fraction is None or not progress_callback:
+                    return
+                with progress_lock:
+                    fractions[index] = fraction
+                    overall = sum(fractions[i] * weights[i] for i in fractions) / total_weight
+                    progress_callback(
+                        f"Segmentos: {len(segments)} em {workers} processos | {overall * 100:.1f}%",
+                        overall,
+                        None,
+                        None,
+                    )
+
+            return run_ffmpeg(
+                source_file=segment_file,
+                target_file=work_dir / f"enc_{index:05d}.mkv",
+                crf=crf,
+                codec_args=codec_args,
+                scale_filter=scale_filter,
+                dvd_target=None,
+                cancel_check=cancel_check,
+                threads=threads,
+                progress_callback=on_segment_progress,
+                duration=seg_duration,
+                stats=segment_stats[index],
+                event_callback=event_callback,
+                speed_profile=speed_profile,
+                log_file=log_file,
+            )
+
+        with ThreadPoolExecutor(max_workers=workers, thread_name_prefix="ffmpeg-segment") as pool:
+            results = list(pool.map(encode_segment, range(len(segments))))
+        for part in segment_stats:
+            _accumulate_stats(stats, part)
+        if any(canceled for _, _, canceled in results):
+            return False, f"CANCELADO: {source_file.name}", True
+        failed = [msg for ok, msg, _ in results if not ok]
+        if failed:
+            return False, f"FALHA: {source_file.name}\n{failed[0]}", False
+
+        concat_list = work_dir / "concat.txt"
+        concat_list.write_text(
+            "".join(f"file '{(work_dir / f'enc_{i:05d}.mkv').as_posix()}'\n" for i in range(len(segments))),
+            encoding="utf-8",
+        )
+        if progress_callback:
+            progress_callback("Unindo segmentos...", 1.0, None, None)
+        concat_stats: dict = {}
+        partial_file = partial_output_path(target_file)
+        returncode, error_msg, canceled = execute_ffmpeg(
+            [
+                "ffmpeg",
+                "-y",
+                "-nostats",
+                "-progress",
+                "pipe:1",
+                "-f",
+                "concat",
+                "-safe",
+                "0",
+                "-i",
+                str(concat_list),
+                "-i",
+                str(source_file),
+                *build_stream_args(media_info, target_file.suffix.lstrip(".").lower(), input_index=1, video_map="0:v:0"),
+                "-c:v",
+                "copy",
+                str(partial_file),
+            ],
+            cancel_check,
+            stats=concat_stats,
+            event_callback=event_callback,
+            log_file=log_file,
+        )
+        _accumulate_stats(stats, concat_stats)
+        commit_error = commit_outputs([(partial_file, target_file)], returncode == 0 and not canceled)
+        if canceled:
+            return False, f"CANCELADO: {source_file.name}", True
+        if commit_error:
+            return False, f"FALHA: {source_file.name}\n{commit_error}", False
+        if returncode != 0:
+            return False, f"FALHA: {source_file.name}\n{error_msg or 'Falha ao unir segmentos.'}", False
+        return True, f"OK (segmentado): {target_file}", False
+    finally:
+        shutil.rmtree(work_dir, ignore_errors=True)
+
+
+def sample_windows(duration: float, count: int, length: float) -> list[tuple[float, float]]:
+    if duration <= count * length:
+        return [(0.0, duration)]
+    return [((i + 0.5) * duration / count - length / 2, length) for i in range(count)]
+
+
+def predict_queue(
+    selected_videos: list[Path],
+    output_format: str,
+    codec_name: str,
+    quality_name: str,
+    resolution_name: str,
+    dvd_profile_name: str,
+    renditions: list[Rendition] | None = None,
+    speed_profile: str = DEFAULT_SPEED_PROFILE,
+    max_workers: int = 1,
+    allow_stream_copy: bool = True,
+    cancel_check: CancelCheck | None = None,
+    progress_callback: ProgressCallback | None = None,
+) -> dict[Path, dict]:
+    queue = list(selected_videos)
+    media_info = probe_media_many(queue)
+    dvd_target = None if renditions else DVD_TARGET_PRESETS[dvd_profile_name]
+    if speed_profile == AUTO_SPEED_PROFILE:
+        speed_profile = DEFAULT_SPEED_PROFILE
+    targets = (
+        [(fmt, codec, quality, resolution, None) for fmt, codec, quality, resolution in renditions]
+        if renditions
+        else [(output_format, codec_name, quality_name, resolution_name, dvd_target)]
+    )
+    predictions: dict[Path, dict] = {}
+    samples: list[tuple[Path, int, tuple[float, float], float]] = []
+    for source_file in queue:
+        info = media_info.get(source_file)
+        duration = media_duration(info)
+        if duration is None:
+            continue
+        resolution = RESOLUTION_PRESETS[resolution_name]
+        if (
+            allow_stream_copy
+            and not renditions
+            and not dvd_target
+            and can_stream_copy(info, CODEC_PRESETS[codec_name], resolution, output_format)
+        ):
+            predictions[source_file] = {"seconds": duration * 0.01, "bytes": source_file.stat().st_size, "copy": True}
+            continue
+        predictions[source_file] = {"seconds": 0.0, "bytes": 0, "copy": False}
+        windows = sample_windows(duration, PREDICT_SAMPLES, PREDICT_SAMPLE_SECONDS)
+        scale = duration / sum(length for _, length in windows)
+        samples.extend((source_file, target, window, scale) for target in range(len(targets)) for window in windows)
+
+    workers = resolve_worker_count(max_workers, len(samples))
+    threads = threads_per_job(workers) if workers > 1 else None
+    progress_lock = threading.Lock()
+    completed = {"count": 0}
+
+    with tempfile.TemporaryDirectory(prefix="previsao_") as tmp_dir:
+
+        def encode_sample(number: int) -> tuple[Path, float, int] | None:
+            source_file, target, (start, length), scale = samples[number]
+            if cancel_check and cancel_check():
+                return None
+            fmt, codec, quality, target_resolution, dvd = targets[target]
+            stats: dict = {}
+            sample_file = Path(tmp_dir) / f"amostra_{number:05d}.{'mpg' if dvd else fmt}"
+            ok, _, canceled = run_ffmpeg(
+                source_file=source_file,
+                target_file=sample_file,
+                crf=QUALITY_PRESETS[quality],
+                codec_args=CODEC_PRESETS[codec],
+                scale_filter=build_scale_filter(RESOLUTION_PRESETS[target_resolution]),
+                dvd_target=dvd,
+                threads=threads,
+                stats=stats,
+                speed_profile=speed_profile,
+                sample_window=(start, length),
+                media_info=media_info.get(source_file),
+                cancel_check=cancel_check,
+            )
+            with progress_lock:
+                completed["count"] += 1
+                if progress_callback:
+                    progress_callback(
+                        f"Estimando: amostra {completed['count']}/{len(samples)} ({source_file.name})",
+                        completed["count"] / len(samples),
+                        None,
+                        None,
+                    )
+            if not ok or canceled:
+                return None
+            size = sample_file.stat().st_size
+            sample_file.unlink(missing_ok=True)
+            return source_file, (stats.get("wall_seconds") or 0.0) * scale, int(size * scale)
+
+        with ThreadPoolExecutor(max_workers=workers, thread_name_prefix="ffmpeg-sample") as pool:
+            for result in pool.map(encode_sample, range(len(samples))):
+                if result is None:
+                    continue
+                source_file, seconds, size = result
+                predictions[source_file]["seconds"] += seconds
+                predictions[source_file]["bytes"] += size
+    return {path: value for path, value in predictions.items() if value["bytes"] > 0}
+
+
+def predict_report(predictions: dict[Path, dict], total: int, max_workers: int = 1) -> str:
+    if not predictions:
+        return "Nao foi possivel estimar: nenhuma amostra codificada."
+    workers = resolve_worker_count(max_workers, len(predictions))
+    total_seconds = sum(value["seconds"] for value in predictions.values())
+    total_bytes = sum(value["bytes"] for value in predictions.values())
+    lines = [
+        f"Previsao para {len(predictions)} de {total} video(s): ~{format_timestamp(total_seconds / workers)} "
+        f"com {workers} conversao(oes) simultanea(s) | ~{total_bytes / 1024**3:.2f} GB",
+    ]
+    for path, value in list(predictions.items())[:SUMMARY_MAX_SUCCESSES]:
+        mode = " (copia de streams)" if value.get("copy") else ""
+        lines.append(f"{path.name}: ~{format_timestamp(value['seconds'])} | ~{value['bytes'] / 1024**2:.0f} MB{mode}")
+    if len(predictions) > SUMMARY_MAX_SUCCESSES:
+        lines.append(f"... e mais {len(predictions) - SUMMARY_MAX_SUCCESSES} video(s).")
+    return "\n".join(lines)
+
+
+def parse_quality_score(metric: str, text: str) -> float | None:
+    pattern = QUALITY_SCORE_PATTERNS[metric]
+    matches = re.findall(pattern, text)
+    if not matches:
+        return None
+    try:
+        return float(matches[-1])
+    except ValueError:
+        return None
+
+
+def resolve_quality_metric(metric: str) -> str:
+    filters = ffmpeg_capabilities().get("filters", set())
+    if metric == "VMAF" and filters and QUALITY_METRICS["VMAF"] not in filters:
+        return "SSIM"
+    return metric
+
+
+def measure_quality(
+    distorted_file: Path,
+    source_file: Path,
+    window: tuple[float, float],
+    metric: str,
+    cancel_check: CancelCheck | None = None,
+    reference_filter: str | None = None,
+) -> float | None:
+    reference_chain = f"{reference_filter},format=yuv420p" if reference_filter else "format=yuv420p"
+    graph = (
+        f"[0:v]format=yuv420p[d0];[1:v]{reference_chain}[r0];"
+        f"[d0][r0]scale2ref=flags=bicubic[d][r];[d][r]{QUALITY_METRICS[metric]}"
+    )
+    cmd = [
+        "ffmpeg",
+        "-hide_banner",
+        "-nostats",
+        "-i",
+        str(distorted_file),
+        "-ss",
+        f"{window[0]:.3f}",
+        "-t",
+        f"{window[1]:.3f}",
+        "-i",
+        str(source_file),
+        "-lavfi",
+        graph,
+        "-an",
+        "-f",
+        "null",
+        "-",
+    ]
+    returncode, output, canceled = execute_ffmpeg(cmd, cancel_check)
+    if returncode != 0 or canceled:
+        return None
+    return parse_quality_score(metric, output)
+
+
+def interpolate_crf(points: list[tuple[int, float]], target: float) -> int:
+    points = sorted(points)
+    if points[0][1] < target:
+        return points[0][0]
+    for (low_crf, low_score), (high_crf, high_score) in zip(points, points[1:]):
+        if high_score < target <= low_score:
+            fraction = (low_score - target) / max(low_score - high_score, 1e-9)
+            return int(low_crf + fraction * (high_crf - low_crf))
+    return points[-1][0]
+
+
+def search_crf(
+    source_file: Path,
+    duration: float,
+    codec_args: list[str],
+    scale_filter: str | None,
+    metric: str,
+    target: float,
+    speed_profile: str = DEFAULT_SPEED_PROFILE,
+    workers: int = 1,
+    cancel_check: CancelCheck | None = None,
+    progress_callback: ProgressCallback | None = None,
+) -> int | None:
+    grid = CRF_SEARCH_GRIDS[codec_args[1]]
+    windows = sample_windows(duration, QUALITY_SAMPLES, QUALITY_SAMPLE_SECONDS)
+    tasks = [(crf, window) for crf in grid for window in windows]
+    scores: dict[int, list[float]] = {crf: [] for crf in grid}
+    progress_lock = threading.Lock()
+    completed = {"count": 0}
+
+    with tempfile.TemporaryDirectory(prefix="busca_crf_") as tmp_dir:
+
+        def score_sample(number: int) -> tuple[int, float | None]:
+            crf, window = tasks[number]
+            if cancel_check and cancel_check():
+                return crf, None
+            sample_file = Path(tmp_dir) / f"crf{crf}_{number:03d}.mkv"
+            ok, _, canceled = run_ffmpeg(
+                source_file=source_file,
+                target_file=sample_file,
+                crf=str(crf),
+                codec_args=codec_args,
+                scale_filter=scale_filter,
+                dvd_target=None,
+                cancel_check=cancel_check,
+                threads=1,
+                speed_profile=speed_profile,
+                sample_window=window,
+            )
+            score = (
+                measure_quality(sample_file, source_file, window, metric, cancel_check, scale_filter)
+                if ok and not canceled
+                else None
+            )
+            sample_file.unlink(missing_ok=True)
+            with progress_lock:
+                completed["count"] += 1
+                if progress_callback:
+                    progress_callback(
+                        f"Buscando CRF para {metric} {target:g}: amostra {completed['count']}/{len(tasks)}",
+                        None,
+                        None,
+                        None,
+                    )
+            return crf, score
+
+        with ThreadPoolExecutor(max_workers=max(1, min(workers, len(tasks))), thread_name_prefix="crf-search") as pool:
+            for crf, score in pool.map(score_sample, range(len(tasks))):
+                if score is not None:
+                    scores[crf].append(score)
+    points = [(crf, sum(values) / len(values)) for crf, values in scores.items() if values]
+    if len(points) < 2 or (cancel_check and cancel_check()):
+        return None
+    return interpolate_crf(points, target)
 
+
+def quality_target_crf(
+    source_file: Path,
+    info: dict | None,
+    codec_args: list[str],
+    resolution_name: str,
+    metric: str,
+    target: float,
+    speed_profile: str = DEFAULT_SPEED_PROFILE,
+    workers: int = 1,
+    cancel_check: CancelCheck | None = None,
+    progress_callback: ProgressCallback | None = None,
+    input_file: Path | None = None,
+) -> tuple[int | None, bool]:
+    duration = media_duration(info)
+    encoder = codec_args[1] if len(codec_args) > 1 else ""
+    if duration is None or encoder not in CRF_SEARCH_GRIDS:
+        return None, False
+    cache = get_media_cache()
+    cache_key = f"{encoder}|{metric}|{target:g}|{resolution_name}|{speed_profile}"
+    cached = cache.get_extra(source_file, "crf_alvo").get(cache_key)
+    if cached is not None:
+        return int(cached), True
+    crf = search_crf(
+        source_file=input_file or source_file,
+        duration=duration,
+        codec_args=codec_args,
+        scale_filter=build_scale_filter(RESOLUTION_PRESETS[resolution_name]),
+        metric=metric,
+        target=target,
+        speed_profile=speed_profile,
+        workers=workers,
+        cancel_check=cancel_check,
+        progress_callback=progress_callback,
+    )
+    if crf is not None:
+        cache.put_extra(source_file, "crf_alvo", cache_key, crf)
+        cache.save()
+    return crf, False
+
+
+def ffmpeg_capabilities() -> dict[str, set[str]]:
+    global _ffmpeg_capabilities
+    stamp = _binary_stamp("ffmpeg")
+    if _ffmpeg_capabilities is not None and _ffmpeg_capabilities[0] == stamp:
+        return _ffmpeg_capabilities[1]
+    cache_file = user_config_dir() / CAPABILITIES_CACHE_FILE
+    try:
+        cached = json.loads(cache_file.read_text(encoding="utf-8"))
+        if cached.get("stamp") == stamp and set(cached["capabilities"]) == set(CAPABILITY_LISTINGS):
+            capabilities = {kind: set(names) for kind, names in cached["capabilities"].items()}
+            _ffmpeg_capabilities = (stamp, capabilities)
+            return capabilities
+    except (OSError, ValueError, KeyError, AttributeError, TypeError):
+        pass
+    capabilities: dict[str, set[str]] = {kind: set() for kind in CAPABILITY_LISTINGS}
+    if stamp is None:
+        return capabilities
+    for kind, header_end in CAPABILITY_LISTINGS.items():
+        result = subprocess.run(["ffmpeg", "-hide_banner", f"-{kind}"], capture_output=True, text=True)
+        listing = result.stdout.split(header_end, 1)[-1] if header_end else result.stdout
+        for line in listing.splitlines():
+            parts = line.split()
+            if len(parts) >= 2:
+                capabilities[kind].update(parts[1].split(","))
+    if capabilities["encoders"] and capabilities["muxers"]:
         try:
-            stdout, stderr = process.communicate(timeout=0.4)
-            exit_code = process.returncode
-            if exit_code == 0:
-                return True, f"OK: {target_file}", False
-            error_msg = (stderr or stdout or "").strip() or "Erro desconhecido no FFmpeg."
-            return False, f"FALHA: {source_file.name}\n{error_msg}", False
-        except subprocess.TimeoutExpired:
+            cache_file.parent.mkdir(parents=True, exist_ok=True)
+            payload = {"stamp": stamp, "capabilities": {kind: sorted(names) for kind, names in capabilities.items()}}
+            cache_file.write_text(json.dumps(payload), encoding="utf-8")
+        except OSError:
+            pass
+        _ffmpeg_capabilities = (stamp, capabilities)
+    return capabilities
+
+
+def check_output_combination(
+    output_format: str,
+    codec_name: str,
+    dvd_target: str | None,
+    capabilities: dict[str, set[str]],
+) -> tuple[list[str], list[str]]:
+    errors: list[str] = []
+    warnings: list[str] = []
+    if dvd_target:
+        encoders = ["mpeg2video", "ac3"]
+        muxer = "dvd"
+    else:
+        encoder = CODEC_PRESETS[codec_name][1]
+        audio_encoder = build_audio_args(output_format)[1]
+        encoders = [encoder, audio_encoder]
+        muxer = OUTPUT_MUXERS.get(output_format, output_format)
+        label = f"{codec_name} em .{output_format}"
+        video_codec = ENCODER_CODEC_NAMES.get(encoder, encoder)
+        audio_codec = AUDIO_ENCODER_CODEC_NAMES.get(audio_encoder, audio_encoder)
+        if container_tolerates(output_format, "video", video_codec):
+            warnings.append(f"{label}: combinacao fora do padrao; alguns players podem nao reproduzir.")
+        elif not container_accepts(output_format, "video", video_codec):
+            errors.append(f"{label}: o formato nao aceita este codec de video.")
+        if container_tolerates(output_format, "audio", audio_codec):
+            warnings.append(f"{label}: audio {audio_encoder} fora do padrao; alguns players podem nao reproduzir.")
+        elif not container_accepts(output_format, "audio", audio_codec):
+            errors.append(f"{label}: o formato nao aceita o audio {audio_encoder}.")
+        if encoder in BITRATE_ONLY_ENCODERS:
+            errors.append(f"{codec_name}: exige bitrate e resolucao fixos; os presets de qualidade (CRF) nao funcionam.")
+        elif encoder not in CRF_ENCODERS:
+            warnings.append(f"{codec_name}: nao suporta CRF; o preset de qualidade sera ignorado pelo encoder.")
+    if capabilities["encoders"]:
+        for encoder in encoders:
+            if encoder not in capabilities["encoders"]:
+                errors.append(f"Encoder {encoder} nao disponivel nesta instalacao do FFmpeg.")
+    if capabilities["muxers"] and muxer not in capabilities["muxers"]:
+        errors.append(f"Formato de saida {muxer} nao disponivel nesta instalacao do FFmpeg.")
+    return errors, warnings
+
+
+def preflight_queue(
+    queue: list[Path],
+    media_info: dict[Path, dict | None],
+    output_dir: Path | None,
+    output_format: str,
+    codec_name: str,
+    resolution_name: str,
+    dvd_target: str | None,
+    renditions: list[Rendition] | None = None,
+    allow_stream_copy: bool = True,
+    predictions: dict[Path, dict] | None = None,
+    dvd_medium: str = DEFAULT_DVD_MEDIUM,
+) -> tuple[dict[int, str], list[str]]:
+    capabilities = ffmpeg_capabilities()
+    combos = (
+        [(fmt, codec, None) for fmt, codec, _quality, _resolution in renditions]
+        if renditions
+        else [(output_format, codec_name, dvd_target)]
+    )
+    combo_errors: list[str] = []
+    warnings: list[str] = []
+    for combo in dict.fromkeys(combos):
+        errors, combo_warnings = check_output_combination(*combo, capabilities)
+        combo_errors.extend(errors)
+        warnings.extend(combo_warnings)
+    if not capabilities["encoders"]:
+        warnings.append("Nao foi possivel listar os encoders do FFmpeg; a validacao de codecs foi parcial.")
+
+    codec_args = CODEC_PRESETS[codec_name]
+    resolution = RESOLUTION_PRESETS[resolution_name]
+    job_errors: dict[int, str] = {}
+    needed: dict[Path, int] = {}
+    dropped_streams = 0
+    for index, source_file in enumerate(queue):
+        info = media_info.get(source_file)
+        if not source_file.is_file():
+            job_errors[index] = f"Arquivo nao encontrado: {source_file}"
+            continue
+        if not os.access(source_file, os.R_OK):
+            job_errors[index] = f"Sem permissao de leitura: {source_file}"
+            continue
+        if info is not None and not media_streams(info, "video"):
+            job_errors[index] = "O arquivo nao tem faixa de video."
+            continue
+        stream_copy = (
+            allow_stream_copy
+            and not dvd_target
+            and not renditions
+            and can_stream_copy(info, codec_args, resolution, output_format)
+        )
+        if combo_errors and not stream_copy:
+            job_errors[index] = "\n".join(combo_errors)
+            continue
+        target_dir = output_dir if output_dir else source_file.parent
+        if not target_dir.is_dir() or not os.access(target_dir, os.W_OK):
+            job_errors[index] = f"Pasta de saida inexistente ou sem permissao de escrita: {target_dir}"
+            continue
+        if not dvd_target and not renditions:
+            dropped_streams += stream_plan_summary(plan_streams(info, output_format))["drop"] > 0
+        predicted = (predictions or {}).get(source_file)
+        estimate = predicted["bytes"] if predicted else source_file.stat().st_size * max(1, len(renditions or []))
+        needed[target_dir] = needed.get(target_dir, 0) + estimate
+
+    if dvd_target and DVD_MEDIA.get(dvd_medium):
+        planned = [index for index in range(len(queue)) if index not in job_errors]
+        video_kbps, plan_note = plan_dvd_bitrate(
+            [media_duration(media_info.get(queue[index])) for index in planned],
+            dvd_medium,
+        )
+        if video_kbps is None:
+            job_errors.update((index, plan_note) for index in planned)
+        else:
+            warnings.append(plan_note)
+    if dropped_streams:
+        warnings.append(
+            f"{dropped_streams} video(s) tem faixas de audio ou legenda que o formato .{output_format} "
+            "nao comporta; essas faixas serao descartadas."
+        )
+    for target_dir, estimate in needed.items():
+        try:
+            free = shutil.disk_usage(target_dir).free
+        except OSError:
             continue
+        if free < estimate:
+            warnings.append(
+                f"Pouco espaco em {target_dir}: {free / 1024**3:.1f} GB livres para ate "
+                f"{estimate / 1024**3:.1f} GB estimados."
+            )
+    return job_errors, list(dict.fromkeys(warnings))
+
+
+def preflight_report(
+    selected_videos: list[Path],
+    selected_output_dir: Path | None,
+    output_format: str,
+    codec_name: str,
+    resolution_name: str,
+    dvd_profile_name: str,
+    renditions: list[Rendition] | None = None,
+    allow_stream_copy: bool = True,
+    predictions: dict[Path, dict] | None = None,
+    dvd_medium: str = DEFAULT_DVD_MEDIUM,
+) -> str:
+    queue = list(selected_videos)
+    job_errors, warnings = preflight_queue(
+        queue,
+        probe_media_many(queue),
+        selected_output_dir,
+        output_format,
+        codec_name,
+        resolution_name,
+        None if renditions else DVD_TARGET_PRESETS[dvd_profile_name],
+        renditions,
+        allow_stream_copy,
+        predictions,
+        dvd_medium,
+    )
+    lines = [f"Validacao: {len(queue) - len(job_errors)} de {len(queue)} video(s) prontos para converter."]
+    lines.extend(f"Aviso: {warning}" for warning in warnings)
+    lines.extend(
+        f"FALHA: {queue[index].name}\n{reason}" for index, reason in list(job_errors.items())[:SUMMARY_MAX_FAILURES]
+    )
+    if len(job_errors) > SUMMARY_MAX_FAILURES:
+        lines.append(f"... e mais {len(job_errors) - SUMMARY_MAX_FAILURES} video(s) com problema.")
+    return "\n\n".join(lines)
+
+
+def compact_results(results: list[str]) -> list[str]:
+    successes = [msg for msg in results if msg.startswith("OK")]
+    problems = [msg for msg in results if not msg.startswith("OK")]
+    lines: list[str] = []
+    for msg in problems[:SUMMARY_MAX_FAILURES]:
+        head, *rest = msg.splitlines()
+        log_line = [line for line in rest if line.startswith("Log completo:")]
+        details = [line for line in rest if not line.startswith("Log completo:")][-SUMMARY_TAIL_LINES:]
+        lines.append("\n".join([head, *details, *log_line]))
+    if len(problems) > SUMMARY_MAX_FAILURES:
+        lines.append(f"... e mais {len(problems) - SUMMARY_MAX_FAILURES} falha(s) ou cancelamento(s).")
+    lines.extend(successes[:SUMMARY_MAX_SUCCESSES])
+    if len(successes) > SUMMARY_MAX_SUCCESSES:
+        lines.append(f"... e mais {len(successes) - SUMMARY_MAX_SUCCESSES} arquivo(s) convertido(s).")
+    return lines
 
 
 def convert_video_queue(
@@ -174,70 +1781,412 @@ def convert_video_queue(
     dvd_profile_name: str,
     progress_callback: ProgressCallback | None = None,
     cancel_check: CancelCheck | None = None,
+    max_workers: int = 1,
+    allow_stream_copy: bool = True,
+    split_workers: int = 1,
+    job_callback: JobCallback | None = None,
+    event_log: "JobEventLog | None" = None,
+    renditions: list[Rendition] | None = None,
+    speed_profile: str = DEFAULT_SPEED_PROFILE,
+    target_fps: float | None = None,
+    deadline_seconds: float | None = None,
+    scheduling_policy: str | None = None,
+    priorities: dict[Path, int] | None = None,
+    enqueue_times: dict[Path, float] | None = None,
+    scratch_dir: Path | None = None,
+    scratch_budget_bytes: int | None = None,
+    log_dir: Path | None = None,
+    predictions: dict[Path, dict] | None = None,
+    quality_metric: str | None = None,
+    quality_target: float | None = None,
+    dvd_medium: str = DEFAULT_DVD_MEDIUM,
+    dvd_two_pass: bool = False,
 ) -> str:
     codec_args = CODEC_PRESETS[codec_name]
     crf = QUALITY_PRESETS[quality_name]
-    scale_filter = build_scale_filter(RESOLUTION_PRESETS[resolution_name])
-    dvd_target = DVD_TARGET_PRESETS[dvd_profile_name]
+    resolution = RESOLUTION_PRESETS[resolution_name]
+    scale_filter = build_scale_filter(resolution)
+    dvd_target = None if renditions else DVD_TARGET_PRESETS[dvd_profile_name]
+    target_format = "mpg" if dvd_target else output_format
 
-    total = len(selected_videos)
-    done = 0
-    failures = 0
-    messages: list[str] = []
+    queue = list(selected_videos)
+    total = len(queue)
+    media_info = probe_media_many(queue)
+    workers = resolve_worker_count(max_workers, total)
+    split_workers = max(1, split_workers)
+    job_threads = threads_per_job(workers) if workers > 1 else None
+    segment_threads = threads_per_job(workers * split_workers)
+    state = {"done": 0, "done_weight": 0.0, "started": 0, "failures": 0, "skipped": False}
+    predicted = [(predictions or {}).get(path, {}).get("seconds") for path in queue]
+    weights = predicted if all(predicted) else [1.0] * total
+    total_weight = sum(weights) or 1.0
+    state_lock = threading.Lock()
+    results: list[str | None] = [None] * total
+    active: dict[int, float] = {}
+    notes: list[str] = []
+    batch_id = f"{time.strftime('%Y%m%d-%H%M%S')}-{uuid.uuid4().hex[:8]}"
+    queued_at = time.monotonic()
+    from job_metrics import JobLogDir
+    from scheduler import DEFAULT_SCHEDULING_POLICY, JobScheduler, resolve_policy
+    from staging import DEFAULT_SCRATCH_BUDGET_BYTES, StagingArea
 
-    for source_file in list(selected_videos):
-        if cancel_check and cancel_check():
-            messages.append("Conversao cancelada pelo usuario.")
-            break
+    staging = StagingArea(scratch_dir, scratch_budget_bytes or DEFAULT_SCRATCH_BUDGET_BYTES) if scratch_dir else None
+    job_logs = JobLogDir(log_dir or user_config_dir() / "logs" / "ffmpeg")
+
+    def emit(index: int, event: str, **fields) -> None:
+        if event_log:
+            event_log.emit(event, f"{batch_id}-{index + 1:05d}", **fields)
+
+    def emit_finished(
+        index: int,
+        status: str,
+        started_at: float,
+        stats: dict,
+        target_file: Path | None = None,
+        duration: float | None = None,
+        mode: str | None = None,
+    ) -> None:
+        if not event_log:
+            return
+        wall = time.monotonic() - started_at
+        output_bytes = None
+        if target_file and status == "ok":
+            try:
+                output_bytes = target_file.stat().st_size
+            except OSError:
+                pass
+        try:
+            input_bytes = queue[index].stat().st_size
+        except OSError:
+            input_bytes = None
+        emit(
+            index,
+            "finished",
+            status=status,
+            mode=mode,
+            exit_code=stats.get("exit_code"),
+            wall_seconds=round(wall, 3),
+            cpu_seconds=round(stats["cpu_seconds"], 3) if stats.get("cpu_seconds") is not None else None,
+            peak_rss_kb=stats.get("peak_rss_kb"),
+            input_bytes=input_bytes,
+            output_bytes=output_bytes,
+            speed=round(duration / wall, 3) if duration and wall and status == "ok" else None,
+        )
 
+    def report(message: str, progress_value: float | None) -> None:
         if progress_callback:
-            progress_callback(
-                f"Convertendo {done + 1}/{total}: {source_file.name}",
-                None,
-                done,
-                total,
-            )
+            progress_callback(message, progress_value, state["done"], total)
+
+    def finish_job(index: int, msg: str, ok: bool) -> None:
+        with state_lock:
+            active.pop(index, None)
+            results[index] = msg
+            state["done"] += 1
+            state["done_weight"] += weights[index]
+            if not ok:
+                state["failures"] += 1
+            done = state["done"]
+            report(f"Convertendo... {done}/{total}", state["done_weight"] / total_weight if total else 0)
+        if job_callback:
+            job_callback(queue[index], ok, msg)
+
+    def run_job(index: int, source_file: Path, job_cancel: CancelCheck | None) -> None:
+        if job_cancel and job_cancel():
+            with state_lock:
+                state["skipped"] = True
+            return
+
+        with state_lock:
+            state["started"] += 1
+            position = state["started"]
+            report(f"Convertendo {position}/{total}: {source_file.name}", None)
+        started_at = time.monotonic()
+        emit(index, "started", queue_wait_seconds=round(started_at - queued_at, 3))
+        stats: dict = {}
 
         if not source_file.exists():
-            failures += 1
-            done += 1
-            messages.append(f"FALHA: arquivo nao encontrado - {source_file}")
-            if progress_callback:
-                progress_callback(
-                    f"Convertendo... {done}/{total}",
-                    done / total if total else 0,
-                    done,
-                    total,
+            emit_finished(index, "missing", started_at, stats)
+            finish_job(index, f"FALHA: arquivo nao encontrado - {source_file}", False)
+            return
+
+        input_file = source_file
+        if staging:
+            staging.prefetch(source_file)
+            for upcoming in job_scheduler.peek(workers):
+                staging.prefetch(queue[upcoming])
+            with state_lock:
+                report(f"Copiando para o disco local {position}/{total}: {source_file.name}", None)
+            input_file = staging.acquire(source_file)
+            emit(index, "staged", local=input_file != source_file)
+
+        def on_file_progress(message: str, fraction: float | None, _done: int | None, _total: int | None) -> None:
+            with state_lock:
+                if fraction is not None:
+                    active[index] = fraction
+                overall = (
+                    (state["done_weight"] + sum(active[i] * weights[i] for i in active)) / total_weight
+                    if fraction is not None
+                    else None
                 )
-            continue
+                status = f"Convertendo {position}/{total}: {source_file.name}"
+                report(f"{status}\n{message}" if message else status, overall)
 
-        target_format = "mpg" if dvd_target else output_format
-        target_file = build_output_path(source_file, selected_output_dir, target_format)
-        ok, msg, canceled = run_ffmpeg(
-            source_file=source_file,
-            target_file=target_file,
-            crf=crf,
-            codec_args=codec_args,
-            scale_filter=scale_filter,
-            dvd_target=dvd_target,
-            cancel_check=cancel_check,
+        info = media_info.get(source_file)
+        stream_copy = (
+            allow_stream_copy
+            and not dvd_target
+            and not renditions
+            and can_stream_copy(info, codec_args, resolution, output_format)
         )
+        duration = media_duration(info)
+        target_file = build_output_path(source_file, selected_output_dir, target_format)
+        local_target = None
+        if staging and not renditions:
+            local_target = staging.local_output(target_file, source_file.stat().st_size)
+        output_file = local_target or target_file
+
+        def on_event(event: str, fields: dict) -> None:
+            emit(index, event, **fields)
+
+        if info is not None and not dvd_target and not renditions:
+            emit(index, "stream_plan", **stream_plan_summary(plan_streams(info, target_format)))
+
+        job_crf = crf
+        crf_note = ""
+        if quality_metric and quality_target and not stream_copy and not dvd_target and not renditions:
+            with state_lock:
+                report(f"Convertendo {position}/{total}: {source_file.name}\nBuscando o CRF para a meta de qualidade...", None)
+            found_crf, cached = quality_target_crf(
+                source_file=source_file,
+                info=info,
+                codec_args=codec_args,
+                resolution_name=resolution_name,
+                metric=quality_metric,
+                target=quality_target,
+                speed_profile=speed_profile,
+                workers=threads_per_job(workers),
+                cancel_check=job_cancel,
+                progress_callback=on_file_progress,
+                input_file=input_file,
+            )
+            if found_crf is not None:
+                job_crf = str(found_crf)
+                crf_note = f" [CRF {found_crf} para {quality_metric} {quality_target:g}{', em cache' if cached else ''}]"
+                emit(index, "crf_selected", crf=found_crf, metric=quality_metric, target=quality_target, cached=cached)
+
+        use_split = split_workers > 1 and not stream_copy and not dvd_target and (duration or 0) >= SPLIT_MIN_DURATION
+        mode = "ladder" if renditions else "copy" if stream_copy else "split" if use_split else "encode"
+        log_file = job_logs.open(f"{batch_id}-{index + 1:05d}.log")
+        try:
+            if renditions:
+                ok, msg, canceled = run_rendition_ladder(
+                    source_file=input_file,
+                    renditions=renditions,
+                    output_dir=selected_output_dir or source_file.parent,
+                    cancel_check=job_cancel,
+                    threads=job_threads,
+                    progress_callback=on_file_progress,
+                    duration=duration,
+                    stats=stats,
+                    event_callback=on_event,
+                    speed_profile=speed_profile,
+                    log_file=log_file,
+                    media_info=info,
+                )
+            elif use_split:
+                ok, msg, canceled = run_ffmpeg_split(
+                    source_file=input_file,
+                    target_file=output_file,
+                    crf=job_crf,
+                    codec_args=codec_args,
+                    scale_filter=scale_filter,
+                    workers=split_workers,
+                    duration=duration,
+                    cancel_check=job_cancel,
+                    threads=segment_threads,
+                    progress_callback=on_file_progress,
+                    stats=stats,
+                    event_callback=on_event,
+                    speed_profile=speed_profile,
+                    log_file=log_file,
+                    media_info=info,
+                )
+            else:
+                ok, msg, canceled = run_ffmpeg(
+                    source_file=input_file,
+                    target_file=output_file,
+                    crf=job_crf,
+                    codec_args=codec_args,
+                    scale_filter=scale_filter,
+                    dvd_target=dvd_target,
+                    cancel_check=job_cancel,
+                    threads=job_threads,
+                    progress_callback=on_file_progress,
+                    duration=duration,
+                    stream_copy=stream_copy,
+                    stats=stats,
+                    event_callback=on_event,
+                    speed_profile=speed_profile,
+                    log_file=log_file,
+                    media_info=info,
+                    dvd_video_kbps=dvd_video_kbps,
+                    two_pass=dvd_two_pass,
+                )
+        finally:
+            log_file.close()
+        if not ok and not canceled:
+            msg += f"\nLog completo: {log_file.path}"
+        elif ok:
+            msg += crf_note
+        status = "canceled" if canceled else "ok" if ok else "failed"
+        emit_finished(index, status, started_at, stats, None if renditions else output_file, duration, mode)
+        if staging:
+            staging.release(source_file)
+            if input_file != source_file:
+                msg = msg.replace(str(input_file), str(source_file))
         if canceled:
-            messages.append(msg)
-            break
-        if not ok:
-            failures += 1
-        messages.append(msg)
-        done += 1
-        if progress_callback:
-            progress_callback(
-                f"Convertendo... {done}/{total}",
-                done / total if total else 0,
-                done,
-                total,
+            if local_target:
+                staging.discard_output(local_target)
+            if not (cancel_check and cancel_check()):
+                finish_job(index, f"IGNORADO: {source_file.name} (cancelado pelo usuario)", False)
+                return
+            with state_lock:
+                active.pop(index, None)
+                results[index] = msg
+            return
+        if local_target and not ok:
+            staging.discard_output(local_target)
+        elif local_target:
+            final_msg = msg.replace(str(local_target), str(target_file))
+
+            def on_published(future) -> None:
+                error = future.exception()
+                if error:
+                    finish_job(index, f"FALHA: {source_file.name}\nFalha ao mover a saida para o destino: {error}", False)
+                else:
+                    finish_job(index, final_msg, True)
+
+            staging.publish(local_target, target_file, partial_output_path(target_file)).add_done_callback(on_published)
+            return
+        finish_job(index, msg, ok)
+
+    def process_job(index: int, source_file: Path) -> None:
+        job_control = cancel_check.child(source_file) if isinstance(cancel_check, JobControl) else None
+        try:
+            run_job(index, source_file, job_control or cancel_check)
+        except Exception as exc:
+            if staging:
+                staging.release(source_file)
+            with state_lock:
+                pending = results[index] is None
+            if pending:
+                emit(index, "finished", status="error", reason=str(exc))
+                finish_job(index, f"FALHA: {source_file.name}\n{type(exc).__name__}: {exc}", False)
+        finally:
+            if job_control:
+                job_control.close()
+
+    for index, source_file in enumerate(queue):
+        emit(index, "queued", source=str(source_file))
+
+    job_errors, preflight_notes = preflight_queue(
+        queue,
+        media_info,
+        selected_output_dir,
+        output_format,
+        codec_name,
+        resolution_name,
+        dvd_target,
+        renditions,
+        allow_stream_copy,
+        predictions,
+        dvd_medium,
+    )
+    notes.extend(f"Aviso: {note}" for note in preflight_notes)
+    dvd_video_kbps = None
+    if dvd_target:
+        dvd_video_kbps, _ = plan_dvd_bitrate(
+            [media_duration(media_info.get(path)) for index, path in enumerate(queue) if index not in job_errors],
+            dvd_medium,
+        )
+    if job_errors:
+        report(f"Pre-validacao: {len(job_errors)} de {total} video(s) com problema serao ignorados.", None)
+    for index, reason in job_errors.items():
+        emit(index, "finished", status="invalid", reason=reason.splitlines()[0])
+        finish_job(index, f"FALHA (pre-validacao): {queue[index].name}\n{reason}", False)
+
+    if speed_profile == AUTO_SPEED_PROFILE:
+        speed_profile = DEFAULT_SPEED_PROFILE
+        sample = next((path for path in queue if media_info.get(path) and path.exists()), None)
+        required_speed = 0.0
+        if sample is not None and target_fps:
+            required_speed = target_fps / source_frame_rate(media_info[sample])
+        if deadline_seconds:
+            queue_duration = sum(media_duration(media_info.get(path)) or 0.0 for path in queue)
+            required_speed = max(required_speed, queue_duration / (deadline_seconds * workers * split_workers))
+        if sample is not None and required_speed > 0:
+            speed_profile = calibrate_speed_profile(
+                source_file=sample,
+                duration=media_duration(media_info[sample]),
+                codec_args=codec_args,
+                crf=crf,
+                scale_filter=scale_filter,
+                required_speed=required_speed,
+                threads=job_threads,
+                cancel_check=cancel_check,
+                progress_callback=lambda message, value, _d, _t: report(message, value),
             )
+        notes.append(f"Perfil de velocidade automatico: {speed_profile}")
+
+    if quality_metric and quality_target:
+        metric = resolve_quality_metric(quality_metric)
+        if metric != quality_metric:
+            notes.append(f"{quality_metric} indisponivel neste FFmpeg; usando {metric} com a meta padrao.")
+            quality_metric, quality_target = metric, QUALITY_TARGET_DEFAULTS[metric]
+        if codec_args[1] not in CRF_SEARCH_GRIDS:
+            notes.append(f"Meta de qualidade ignorada: {codec_name} nao usa CRF.")
+
+    policy = resolve_policy(scheduling_policy or DEFAULT_SCHEDULING_POLICY, workers)
+    job_scheduler = JobScheduler(policy)
+    for index, source_file in enumerate(queue):
+        if index in job_errors:
+            continue
+        info = media_info.get(source_file)
+        copy_hint = allow_stream_copy and not dvd_target and can_stream_copy(info, codec_args, resolution, output_format)
+        job_scheduler.push(
+            index,
+            cost=predicted[index] or estimate_job_cost(source_file, info, resolution, copy_hint),
+            priority=(priorities or {}).get(source_file, 1),
+            enqueued_at=(enqueue_times or {}).get(source_file, queued_at),
+        )
 
-    was_canceled = any(m.startswith("CANCELADO:") or "cancelada" in m.lower() for m in messages)
+    def worker_loop() -> None:
+        while True:
+            if isinstance(cancel_check, JobControl):
+                cancel_check.wait_while_paused()
+            index = job_scheduler.pop()
+            if index is None:
+                return
+            process_job(index, queue[index])
+
+    try:
+        if workers == 1:
+            worker_loop()
+        else:
+            with ThreadPoolExecutor(max_workers=workers, thread_name_prefix="ffmpeg-job") as pool:
+                loops = [pool.submit(worker_loop) for _ in range(workers)]
+                for loop in loops:
+                    loop.result()
+    finally:
+        if staging:
+            staging.close()
+
+    messages = notes + compact_results([msg for msg in results if msg is not None])
+    if state["skipped"]:
+        messages.append("Conversao cancelada pelo usuario.")
+    was_canceled = state["skipped"] or any(msg and msg.startswith("CANCELADO:") for msg in results)
+    done = state["done"]
+    failures = state["failures"]
     prefix = "Cancelado." if was_canceled else "Finalizado."
     summary = f"{prefix} Sucesso: {done - failures} | Falhas: {failures}\n\n" + "\n\n".join(messages)
     if dvd_target:
@@ -257,6 +2206,10 @@ def build_dvd_output_dir(base_dir: Path) -> Path:
         index += 1
 
 
+def dvdauthor_video_format(dvd_profile_name: str) -> str:
+    return "pal" if "PAL" in dvd_profile_name.upper() else "ntsc"
+
+
 def collect_mpg_sources(selected_videos: list[Path], selected_output_dir: Path | None) -> list[Path]:
     files: list[Path] = []
     for source in selected_videos:
@@ -267,7 +2220,7 @@ def collect_mpg_sources(selected_videos: list[Path], selected_output_dir: Path |
         return files
 
     base_dir = selected_output_dir if selected_output_dir else Path.cwd()
-    return sorted(base_dir.glob("*.mpg"))
+    return sorted(path for path in base_dir.glob("*.mpg") if not path.name.startswith("."))
 
 
 def run_dvdauthor(
@@ -288,7 +2241,7 @@ def run_dvdauthor(
         output_arg = str(dvd_output_dir)
         mpg_args = [str(f) for f in mpg_files]
 
-    video_format = "pal" if "PAL" in dvd_profile_name.upper() else "ntsc"
+    video_format = dvdauthor_video_format(dvd_profile_name)
     create_titles = _build_dvdauthor_cmd(
         ["dvdauthor", "-o", output_arg, "-f", video_format, "-t", *mpg_args],
         use_wsl,
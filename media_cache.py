@@ -0,0 +1,115 @@
+from collections import OrderedDict
+from pathlib import Path
+import json
+import os
+import threading
+
+
+CACHE_VERSION = 1
+CACHE_MAX_ENTRIES = 20000
+
+
+def _file_key(path: Path) -> str:
+    return os.path.normcase(str(path.resolve()))
+
+
+def _file_stamp(path: Path) -> tuple[int, int] | None:
+    try:
+        stat = path.stat()
+    except OSError:
+        return None
+    return stat.st_size, stat.st_mtime_ns
+
+
+class MediaCache:
+    def __init__(self, cache_file: Path, max_entries: int = CACHE_MAX_ENTRIES):
+        self.cache_file = cache_file
+        self.max_entries = max_entries
+        self._entries: OrderedDict[str, dict] | None = None
+        self._dirty = False
+        self._lock = threading.Lock()
+
+    def _load(self) -> OrderedDict[str, dict]:
+        if self._entries is not None:
+            return self._entries
+        entries: OrderedDict[str, dict] = OrderedDict()
+        try:
+            raw = json.loads(self.cache_file.read_text(encoding="utf-8"))
+            if raw.get("version") == CACHE_VERSION:
+                for key, entry in raw.get("entries", []):
+                    entries[key] = entry
+        except (OSError, ValueError, TypeError, AttributeError):
+            pass
+        self._entries = entries
+        return entries
+
+    def _lookup(self, path: Path) -> dict | None:
+        entries = self._load()
+        key = _file_key(path)
+        entry = entries.get(key)
+        if entry is None:
+            return None
+        stamp = _file_stamp(path)
+        if stamp is None or [entry.get("size"), entry.get("mtime_ns")] != list(stamp):
+            del entries[key]
+            self._dirty = True
+            return None
+        entries.move_to_end(key)
+        return entry
+
+    def get(self, path: Path) -> dict | None:
+        with self._lock:
+            entry = self._lookup(path)
+            return entry.get("info") if entry else None
+
+    def get_many(self, paths: list[Path]) -> dict[Path, dict | None]:
+        with self._lock:
+            found: dict[Path, dict | None] = {}
+            for path in paths:
+                entry = self._lookup(path)
+                found[path] = entry.get("info") if entry else None
+            return found
+
+    def put(self, path: Path, info: dict) -> None:
+        stamp = _file_stamp(path)
+        if stamp is None:
+            return
+        with self._lock:
+            entries = self._load()
+            key = _file_key(path)
+            previous = entries.pop(key, None)
+            entry = {"size": stamp[0], "mtime_ns": stamp[1], "info": info}
+            if previous and [previous.get("size"), previous.get("mtime_ns")] == list(stamp):
+                entry = {**previous, **entry}
+            entries[key] = entry
+            while len(entries) > self.max_entries:
+                entries.popitem(last=False)
+            self._dirty = True
+
+    def get_extra(self, path: Path, name: str) -> dict:
+        with self._lock:
+            entry = self._lookup(path)
+            return dict(entry.get(name) or {}) if entry else {}
+
+    def put_extra(self, path: Path, name: str, key: str, value) -> None:
+        stamp = _file_stamp(path)
+        if stamp is None:
+            return
+        with self._lock:
+            entry = self._lookup(path)
+            if entry is None:
+                entry = {"size": stamp[0], "mtime_ns": stamp[1], "info": None}
+                self._load()[_file_key(path)] = entry
+            entry[name] = {**(entry.get(name) or {}), key: value}
+            self._dirty = True
+
+    def save(self) -> None:
+        with self._lock:
+            if not self._dirty or self._entries is None:
+                return
+            payload = {"version": CACHE_VERSION, "entries": list(self._entries.items())}
+            self.cache_file.parent.mkdir(parents=True, exist_ok=True)
+            tmp_file = self.cache_file.with_name(self.cache_file.name + ".tmp")
+            tmp_file.write_text(json.dumps(payload, separators=(",", ":")), encoding="utf-8")
+            os.replace(tmp_file, self.cache_file)
+            self._dirty = False
@@ -0,0 +1,85 @@
+from pathlib import Path
+from typing import Callable, Iterable, Iterator
+import threading
+import time
+
+
+QueueListener = Callable[[str, int, list[Path]], None]
+
+
+class VideoQueue:
+    def __init__(self):
+        self._items: list[Path] = []
+        self._members: set[Path] = set()
+        self._added_at: dict[Path, float] = {}
+        self._listeners: list[QueueListener] = []
+        self.lock = threading.RLock()
+
+    def subscribe(self, listener: QueueListener) -> None:
+        with self.lock:
+            self._listeners.append(listener)
+
+    def _notify(self, event: str, index: int, paths: list[Path]) -> None:
+        for listener in self._listeners:
+            listener(event, index, paths)
+
+    def add_many(self, paths: Iterable[Path]) -> list[Path]:
+        with self.lock:
+            start = len(self._items)
+            added: list[Path] = []
+            for path in paths:
+                if path in self._members:
+                    continue
+                self._members.add(path)
+                self._added_at[path] = time.monotonic()
+                self._items.append(path)
+                added.append(path)
+            if added:
+                self._notify("added", start, added)
+            return added
+
+    def remove(self, path: Path) -> int | None:
+        with self.lock:
+            if path not in self._members:
+                return None
+            index = self._items.index(path)
+            del self._items[index]
+            self._members.discard(path)
+            self._added_at.pop(path, None)
+            self._notify("removed", index, [path])
+            return index
+
+    def clear(self) -> None:
+        with self.lock:
+            self._items.clear()
+            self._members.clear()
+            self._added_at.clear()
+            self._notify("cleared", 0, [])
+
+    def added_times(self) -> dict[Path, float]:
+        with self.lock:
+            return dict(self._added_at)
+
+    def window(self, start: int, stop: int) -> list[Path]:
+        with self.lock:
+            return self._items[start:stop]
+
+    def index(self, path: Path) -> int:
+        with self.lock:
+            return self._items.index(path)
+
+    def __contains__(self, path: object) -> bool:
+        with self.lock:
+            return path in self._members
+
+    def __len__(self) -> int:
+        with self.lock:
+            return len(self._items)
+
+    def __iter__(self) -> Iterator[Path]:
+        with self.lock:
+            return iter(list(self._items))
+
+    def __getitem__(self, index: int) -> Path:
+        with self.lock:
+            return self._items[index]
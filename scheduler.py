@@ -0,0 +1,60 @@
+import heapq
+import itertools
+import threading
+import time
+
+
+SCHEDULING_POLICIES = {
+    "Ordem da fila": "fifo",
+    "Mais curtos primeiro": "sjf",
+    "Mais longos primeiro": "lpt",
+    "Prioridade": "priority",
+    "Automatico": "auto",
+}
+DEFAULT_SCHEDULING_POLICY = "Ordem da fila"
+PRIORITY_LEVELS = {"Alta": 2, "Normal": 1, "Baixa": 0}
+PRIORITY_AGING_SECONDS = 600.0
+
+
+def resolve_policy(policy_name: str, workers: int) -> str:
+    policy = SCHEDULING_POLICIES.get(policy_name, "fifo")
+    if policy == "auto":
+        return "lpt" if workers > 1 else "sjf"
+    return policy
+
+
+class JobScheduler:
+    def __init__(self, policy: str, aging_seconds: float = PRIORITY_AGING_SECONDS):
+        self.policy = policy
+        self.aging_seconds = aging_seconds
+        self._heap: list[tuple] = []
+        self._order = itertools.count()
+        self._lock = threading.Lock()
+
+    def _key(self, index: int, cost: float, priority: int, enqueued_at: float) -> tuple:
+        if self.policy == "sjf":
+            return (cost, index)
+        if self.policy == "lpt":
+            return (-cost, index)
+        if self.policy == "priority":
+            return (-(priority - enqueued_at / self.aging_seconds), cost, index)
+        return (index,)
+
+    def push(self, index: int, cost: float = 0.0, priority: int = 1, enqueued_at: float | None = None) -> None:
+        key = self._key(index, cost, priority, time.monotonic() if enqueued_at is None else enqueued_at)
+        with self._lock:
+            heapq.heappush(self._heap, (key, next(self._order), index))
+
+    def pop(self) -> int | None:
+        with self._lock:
+            if not self._heap:
+                return None
+            return heapq.heappop(self._heap)[2]
+
+    def peek(self, count: int = 1) -> list[int]:
+        with self._lock:
+            return [entry[2] for entry in heapq.nsmallest(count, self._heap)]
+
+    def __len__(self) -> int:
+        with self._lock:
+            return len(self._heap)
@@ -42,32 +42,19 @@ async def run_startup_splash(
     update_ui: Callable[[], None],
     on_result: Callable[[bool, bool], None],
 ) -> None:
-    step_text.value = "Inicializando interface..."
+    step_text.value = "Verificando FFmpeg e dvdauthor..."
     update_ui()
-    await asyncio.sleep(0.35)
-
-    step_text.value = "Verificando FFmpeg..."
-    update_ui()
-    ffmpeg_ok = await asyncio.to_thread(check_ffmpeg_fn)
+    ffmpeg_ok, dvdauthor_ok = await asyncio.gather(
+        asyncio.to_thread(check_ffmpeg_fn),
+        asyncio.to_thread(check_dvdauthor_fn),
+    )
     ffmpeg_status.value = "FFmpeg detectado no sistema." if ffmpeg_ok else "FFmpeg nao encontrado no PATH."
     ffmpeg_status.color = ft.Colors.GREEN if ffmpeg_ok else ft.Colors.RED
-    update_ui()
-    await asyncio.sleep(0.25)
-
-    step_text.value = "Verificando dvdauthor..."
-    update_ui()
-    dvdauthor_ok = await asyncio.to_thread(check_dvdauthor_fn)
     dvdauthor_status.value = "dvdauthor detectado." if dvdauthor_ok else "dvdauthor nao encontrado no PATH."
     dvdauthor_status.color = ft.Colors.GREEN if dvdauthor_ok else ft.Colors.RED
     convert_button.disabled = not ffmpeg_ok
     create_video_ts_button.disabled = not dvdauthor_ok
     on_result(ffmpeg_ok, dvdauthor_ok)
-    update_ui()
-    await asyncio.sleep(0.35)
-
-    step_text.value = "Recursos carregados. Bem-vindo!"
-    update_ui()
-    await asyncio.sleep(0.45)
 
     splash_container.visible = False
     main_container.visible = True
@@ -0,0 +1,118 @@
+from concurrent.futures import Future, ThreadPoolExecutor
+from pathlib import Path
+import itertools
+import os
+import shutil
+import tempfile
+import threading
+
+
+COPY_BLOCK_BYTES = 8 * 1024 * 1024
+DEFAULT_SCRATCH_BUDGET_BYTES = 20 * 1024**3
+
+
+def copy_sequential(source: Path, target: Path) -> None:
+    with source.open("rb") as fin, target.open("wb") as fout:
+        if hasattr(os, "posix_fadvise"):
+            os.posix_fadvise(fin.fileno(), 0, 0, os.POSIX_FADV_SEQUENTIAL)
+        shutil.copyfileobj(fin, fout, COPY_BLOCK_BYTES)
+
+
+class StagingArea:
+    def __init__(self, scratch_root: Path, budget_bytes: int = DEFAULT_SCRATCH_BUDGET_BYTES):
+        scratch_root.mkdir(parents=True, exist_ok=True)
+        self.scratch_dir = Path(tempfile.mkdtemp(prefix="conversor_", dir=scratch_root))
+        self.budget_bytes = budget_bytes
+        self._reserved = 0
+        self._lock = threading.Lock()
+        self._inputs: dict[Path, tuple[Future, Path, int]] = {}
+        self._outputs: dict[Path, int] = {}
+        self._slots = itertools.count(1)
+        self._reader = ThreadPoolExecutor(max_workers=1, thread_name_prefix="staging-in")
+        self._writer = ThreadPoolExecutor(max_workers=1, thread_name_prefix="staging-out")
+
+    def _new_slot(self, kind: str) -> Path:
+        slot = self.scratch_dir / kind / f"{next(self._slots):05d}"
+        slot.mkdir(parents=True)
+        return slot
+
+    def _reserve(self, size: int) -> bool:
+        if self._reserved + size > self.budget_bytes:
+            return False
+        self._reserved += size
+        return True
+
+    def _free(self, size: int) -> None:
+        with self._lock:
+            self._reserved = max(0, self._reserved - size)
+
+    def prefetch(self, source: Path) -> None:
+        try:
+            size = source.stat().st_size
+        except OSError:
+            return
+        with self._lock:
+            if source in self._inputs or not self._reserve(size):
+                return
+            local = self._new_slot("entrada") / source.name
+            future = self._reader.submit(copy_sequential, source, local)
+            self._inputs[source] = (future, local, size)
+
+    def acquire(self, source: Path) -> Path:
+        self.prefetch(source)
+        with self._lock:
+            entry = self._inputs.get(source)
+        if entry is None:
+            return source
+        future, local, _ = entry
+        try:
+            future.result()
+        except OSError:
+            self.release(source)
+            return source
+        return local
+
+    def release(self, source: Path) -> None:
+        with self._lock:
+            entry = self._inputs.pop(source, None)
+        if entry is None:
+            return
+        future, local, size = entry
+        if future.cancel() or future.done():
+            shutil.rmtree(local.parent, ignore_errors=True)
+        else:
+            future.add_done_callback(lambda _: shutil.rmtree(local.parent, ignore_errors=True))
+        self._free(size)
+
+    def local_output(self, target_file: Path, estimated_bytes: int) -> Path | None:
+        with self._lock:
+            if not self._reserve(estimated_bytes):
+                return None
+            local = self._new_slot("saida") / target_file.name
+            self._outputs[local] = estimated_bytes
+        return local
+
+    def discard_output(self, local_file: Path) -> None:
+        with self._lock:
+            size = self._outputs.pop(local_file, 0)
+        shutil.rmtree(local_file.parent, ignore_errors=True)
+        self._free(size)
+
+    def publish(self, local_file: Path, target_file: Path, partial_file: Path) -> Future:
+        def move() -> None:
+            try:
+                target_file.parent.mkdir(parents=True, exist_ok=True)
+                shutil.move(local_file, partial_file)
+                os.replace(partial_file, target_file)
+            except OSError:
+                partial_file.unlink(missing_ok=True)
+                raise
+            finally:
+                self.discard_output(local_file)
+
+        return self._writer.submit(move)
+
+    def close(self) -> None:
+        self._reader.shutdown(wait=True, cancel_futures=True)
+        self._writer.shutdown(wait=True)
+        shutil.rmtree(self.scratch_dir, ignore_errors=True)
@@ -0,0 +1,297 @@
+from pathlib import Path
+import argparse
+import json
+import os
+import signal
+import threading
+import time
+
+from job_control import JobControl
+from job_metrics import JobEventLog
+from main import (
+    CODEC_PRESETS,
+    DVD_TARGET_PRESETS,
+    OUTPUT_FORMATS,
+    DEFAULT_SPEED_PROFILE,
+    QUALITY_PRESETS,
+    RESOLUTION_PRESETS,
+    SPEED_PROFILES,
+    VIDEO_EXTENSIONS,
+    check_ffmpeg,
+    convert_video_queue,
+    is_converted_output,
+    user_config_dir,
+)
+from staging import DEFAULT_SCRATCH_BUDGET_BYTES
+
+
+def _log(message: str) -> None:
+    print(f"[{time.strftime('%Y-%m-%d %H:%M:%S')}] {message}", flush=True)
+
+
+def _is_candidate(name: str) -> bool:
+    if name.startswith("."):
+        return False
+    path = Path(name)
+    return path.suffix.lower() in VIDEO_EXTENSIONS and not is_converted_output(path)
+
+
+class ProcessedLedger:
+    def __init__(self, ledger_file: Path):
+        self.ledger_file = ledger_file
+        self._seen: dict[str, tuple[int, int]] = {}
+        self._lock = threading.Lock()
+        try:
+            with ledger_file.open(encoding="utf-8") as fh:
+                for line in fh:
+                    try:
+                        entry = json.loads(line)
+                        self._seen[entry["path"]] = (entry["size"], entry["mtime_ns"])
+                    except (ValueError, KeyError, TypeError):
+                        continue
+        except OSError:
+            pass
+
+    def contains(self, path: Path, stamp: tuple[int, int]) -> bool:
+        return self._seen.get(str(path)) == stamp
+
+    def record(self, path: Path, ok: bool, message: str) -> None:
+        try:
+            stat = path.stat()
+        except OSError:
+            return
+        stamp = (stat.st_size, stat.st_mtime_ns)
+        entry = {
+            "path": str(path),
+            "size": stamp[0],
+            "mtime_ns": stamp[1],
+            "ok": ok,
+            "finished_at": time.time(),
+            "message": message.splitlines()[0] if message else "",
+        }
+        with self._lock:
+            self._seen[str(path)] = stamp
+            self.ledger_file.parent.mkdir(parents=True, exist_ok=True)
+            with self.ledger_file.open("a", encoding="utf-8") as fh:
+                fh.write(json.dumps(entry, ensure_ascii=False) + "\n")
+
+
+class FolderWatcher:
+    def __init__(self, watch_dir: Path, ledger: ProcessedLedger, recursive: bool = False, settle_seconds: float = 10.0):
+        self.watch_dir = watch_dir
+        self.ledger = ledger
+        self.recursive = recursive
+        self.settle_seconds = settle_seconds
+        self._dir_mtimes: dict[Path, int] = {}
+        self._subdirs: dict[Path, list[Path]] = {}
+        self._pending: dict[Path, tuple[tuple[int, int], float]] = {}
+        self._queued: set[Path] = set()
+
+    def _scan_changed_dirs(self) -> None:
+        stack = [self.watch_dir]
+        seen_dirs: set[Path] = set()
+        while stack:
+            directory = stack.pop()
+            seen_dirs.add(directory)
+            try:
+                dir_mtime = directory.stat().st_mtime_ns
+            except OSError:
+                continue
+            if self._dir_mtimes.get(directory) != dir_mtime:
+                self._dir_mtimes[directory] = dir_mtime
+                self._subdirs[directory] = self._scan_dir(directory)
+            stack.extend(self._subdirs.get(directory, []))
+        for directory in list(self._dir_mtimes):
+            if directory not in seen_dirs:
+                del self._dir_mtimes[directory]
+                self._subdirs.pop(directory, None)
+
+    def _scan_dir(self, directory: Path) -> list[Path]:
+        subdirs: list[Path] = []
+        try:
+            with os.scandir(directory) as it:
+                for entry in it:
+                    if entry.is_dir(follow_symlinks=False):
+                        if self.recursive and not entry.name.startswith("."):
+                            subdirs.append(Path(entry.path))
+                        continue
+                    if not _is_candidate(entry.name):
+                        continue
+                    path = Path(entry.path)
+                    if path in self._pending or path in self._queued:
+                        continue
+                    try:
+                        stat = entry.stat()
+                    except OSError:
+                        continue
+                    stamp = (stat.st_size, stat.st_mtime_ns)
+                    if not self.ledger.contains(path, stamp):
+                        self._pending[path] = (stamp, time.monotonic())
+        except OSError:
+            pass
+        return subdirs
+
+    def poll(self) -> list[Path]:
+        self._scan_changed_dirs()
+        now = time.monotonic()
+        ready: list[Path] = []
+        for path, (last_stamp, since) in list(self._pending.items()):
+            try:
+                stat = path.stat()
+            except OSError:
+                del self._pending[path]
+                continue
+            stamp = (stat.st_size, stat.st_mtime_ns)
+            if stamp != last_stamp:
+                self._pending[path] = (stamp, now)
+                continue
+            if now - since < self.settle_seconds:
+                continue
+            del self._pending[path]
+            if self.ledger.contains(path, stamp):
+                continue
+            self._queued.add(path)
+            ready.append(path)
+        return sorted(ready)
+
+    def release(self, path: Path) -> None:
+        self._queued.discard(path)
+
+
+def watch_folder(
+    watch_dir: Path,
+    output_dir: Path | None,
+    output_format: str,
+    codec_name: str,
+    quality_name: str,
+    resolution_name: str,
+    dvd_profile_name: str = "Desativado",
+    max_workers: int = 1,
+    recursive: bool = False,
+    interval: float = 5.0,
+    settle_seconds: float = 10.0,
+    ledger_file: Path | None = None,
+    stop_event: threading.Event | None = None,
+    event_log: JobEventLog | None = None,
+    speed_profile: str = DEFAULT_SPEED_PROFILE,
+    scratch_dir: Path | None = None,
+    scratch_budget_bytes: int = DEFAULT_SCRATCH_BUDGET_BYTES,
+    control: JobControl | None = None,
+) -> None:
+    stop_event = stop_event or threading.Event()
+    control = control or JobControl()
+    if output_dir:
+        output_dir.mkdir(parents=True, exist_ok=True)
+    ledger = ProcessedLedger(ledger_file or user_config_dir() / "watch_ledger.jsonl")
+    watcher = FolderWatcher(watch_dir, ledger, recursive=recursive, settle_seconds=settle_seconds)
+
+    def on_job_done(source_file: Path, ok: bool, message: str) -> None:
+        ledger.record(source_file, ok, message)
+        watcher.release(source_file)
+        _log(message.splitlines()[0])
+
+    _log(f"Monitorando {watch_dir} (intervalo {interval}s, estabilizacao {settle_seconds}s)")
+    while not stop_event.is_set():
+        ready = watcher.poll()
+        if ready:
+            _log(f"{len(ready)} arquivo(s) prontos para conversao.")
+            convert_video_queue(
+                selected_videos=ready,
+                selected_output_dir=output_dir,
+                output_format=output_format,
+                codec_name=codec_name,
+                quality_name=quality_name,
+                resolution_name=resolution_name,
+                dvd_profile_name=dvd_profile_name,
+                cancel_check=control,
+                max_workers=max_workers,
+                job_callback=on_job_done,
+                event_log=event_log,
+                speed_profile=speed_profile,
+                scratch_dir=scratch_dir,
+                scratch_budget_bytes=scratch_budget_bytes,
+            )
+            for path in ready:
+                watcher.release(path)
+            continue
+        stop_event.wait(interval)
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description="Converte automaticamente videos que chegam em uma pasta.")
+    parser.add_argument("pasta", type=Path, help="Pasta monitorada")
+    parser.add_argument("--output", type=Path, default=None, help="Pasta de saida (padrao: pasta de cada video)")
+    parser.add_argument("--format", default="mp4", choices=OUTPUT_FORMATS)
+    parser.add_argument("--codec", default="H.265 (HEVC)", choices=list(CODEC_PRESETS))
+    parser.add_argument("--quality", default="Media (CRF 23)", choices=list(QUALITY_PRESETS))
+    parser.add_argument("--resolution", default="Original", choices=list(RESOLUTION_PRESETS))
+    parser.add_argument("--dvd", default="Desativado", choices=list(DVD_TARGET_PRESETS))
+    parser.add_argument("--speed", default=DEFAULT_SPEED_PROFILE, choices=list(SPEED_PROFILES))
+    parser.add_argument("--jobs", type=int, default=1, help="Conversoes simultaneas")
+    parser.add_argument("--recursive", action="store_true", help="Inclui subpastas")
+    parser.add_argument("--interval", type=float, default=5.0, help="Segundos entre verificacoes")
+    parser.add_argument("--settle", type=float, default=10.0, help="Segundos sem crescer antes de converter")
+    parser.add_argument("--ledger", type=Path, default=None, help="Arquivo de registro dos processados")
+    parser.add_argument("--scratch", type=Path, default=None, help="Pasta local para copiar as fontes e gravar as saidas")
+    parser.add_argument("--scratch-budget", type=float, default=DEFAULT_SCRATCH_BUDGET_BYTES / 1024**3, help="Limite da pasta local em GB")
+    parser.add_argument("--events", type=Path, default=None, help="Arquivo JSONL com os eventos de cada job")
+    parser.add_argument("--prom-textfile", type=Path, default=None, help="Arquivo .prom para o textfile collector do node-exporter")
+    args = parser.parse_args()
+
+    if not check_ffmpeg():
+        parser.error("FFmpeg nao encontrado no PATH.")
+    if not args.pasta.is_dir():
+        parser.error(f"Pasta nao encontrada: {args.pasta}")
+
+    stop_event = threading.Event()
+    control = JobControl()
+
+    def stop(_signum, _frame) -> None:
+        stop_event.set()
+        control.cancel()
+
+    def pause(_signum, _frame) -> None:
+        control.pause()
+        _log("Conversoes pausadas (envie SIGUSR2 para retomar).")
+
+    def resume(_signum, _frame) -> None:
+        control.resume()
+        _log("Conversoes retomadas.")
+
+    signal.signal(signal.SIGINT, stop)
+    signal.signal(signal.SIGTERM, stop)
+    if hasattr(signal, "SIGUSR1"):
+        signal.signal(signal.SIGUSR1, pause)
+        signal.signal(signal.SIGUSR2, resume)
+
+    try:
+        watch_folder(
+            watch_dir=args.pasta,
+            output_dir=args.output,
+            output_format=args.format,
+            codec_name=args.codec,
+            quality_name=args.quality,
+            resolution_name=args.resolution,
+            dvd_profile_name=args.dvd,
+            speed_profile=args.speed,
+            max_workers=args.jobs,
+            recursive=args.recursive,
+            interval=args.interval,
+            settle_seconds=args.settle,
+            ledger_file=args.ledger,
+            scratch_dir=args.scratch,
+            scratch_budget_bytes=int(args.scratch_budget * 1024**3),
+            stop_event=stop_event,
+            control=control,
+            event_log=JobEventLog(
+                args.events or user_config_dir() / "logs" / "jobs.jsonl",
+                args.prom_textfile,
+            ),
+        )
+    except KeyboardInterrupt:
+        pass
+    _log("Monitoramento encerrado.")
+
+
+if __name__ == "__main__":
+    main()